@@ -1,9 +1,13 @@
+import argparse
 import json
+import math
 import os
 import random
 import re
+import shutil
 import unicodedata
-from typing import List, Tuple, Optional, Dict, Set
+from functools import lru_cache
+from typing import List, Tuple, Optional, Dict, Set, Sequence
 import sys
 import anthropic
 import genanki
@@ -11,7 +15,15 @@ from rich.console import Console
 from rich.progress import Progress
 from rich.prompt import Prompt, Confirm
 from enum import Enum, auto
-from latex_templates import INITIAL_TEX_CONTENT, SAMPLE_ENTRY, FINAL_TEX_CONTENT, AI_PROMPT_TEMPLATE
+from french_lexicon import SpellSuggester, lemma_candidates
+from latex_templates import (INITIAL_TEX_CONTENT, SAMPLE_ENTRY, FINAL_TEX_CONTENT, AI_SYSTEM_PROMPT, AI_PROMPT_TEMPLATE,
+                             ENTRIES_BEGIN, ENTRIES_END, LATEX_RENDER_VERSION, render_latex_entry, render_entries_chunk,
+                             split_latex_items, split_latex_example, latex_items_to_html)
+from file_lock import FileLock
+from http_transport import PooledTransport
+from pdf_builder import PdfBuilder
+from vocab_lint import ENTRY_START, brace_groups, entry_spans, split_chunks
+from vocab_store import VocabStore
 import time
 import threading
 from rich.table import Table
@@ -20,6 +32,7 @@ from rich.text import Text
 import keyring
 import getpass
 from keyring.errors import KeyringError
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, Future
 
 console = Console()
 
@@ -34,8 +47,136 @@ class WordType(Enum):
     OTHER = auto()
 
 
+@lru_cache(maxsize=None)
+def classify_word_type(word_type: str) -> WordType:
+    """Maps a free-form word type such as "noun (feminine)" onto WordType.
+
+    Labels naming several types ("adjective, noun") map onto the first one.
+    """
+    key = re.sub(r"\(.*?\)", "", word_type).strip().lower().replace("-", " ")
+    if "pronominal" in key or "reflexive" in key:
+        return WordType.PRONOMINAL_VERB
+    match = re.search(r"\b(noun|verb|adjective|adverb|expression|phrase|idiom)\b", key)
+    if not match:
+        return WordType.OTHER
+    if match.group(1) in ("phrase", "idiom"):
+        return WordType.EXPRESSION
+    return WordType[match.group(1).upper()]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of values (0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class VocabEntry:
+    """Compact in-memory record of one vocabulary entry.
+
+    Uses __slots__ instead of a per-entry dict. word_type is the WordType the
+    free-form label maps onto; type_label keeps the label as the AI wrote it
+    (e.g. "noun (feminine)"), interned so that the thousands of entries with
+    the same label share a single string. Definitions and examples are tuples.
+    """
+
+    __slots__ = ("word", "word_type", "type_label", "definitions", "examples")
+
+    def __init__(self, word: str, type_label: str, definitions, examples):
+        self.word = word
+        self.type_label = sys.intern(type_label)
+        self.word_type = classify_word_type(self.type_label)
+        self.definitions: Tuple[str, ...] = tuple(definitions)
+        self.examples: Tuple[Tuple[str, str], ...] = tuple(tuple(example) for example in examples)
+
+    def __repr__(self):
+        return f"VocabEntry({self.word!r}, {self.type_label!r})"
+
+    def to_dict(self) -> Dict:
+        return {
+            "word": self.word,
+            "type": self.type_label,
+            "word_type": self.word_type.name,
+            "definitions": list(self.definitions),
+            "examples": [list(example) for example in self.examples],
+        }
+
+
+class WordPrefetchQueue:
+    """Iterates over queued words while fetching AI responses for upcoming ones.
+
+    While the caller reviews the current word, responses for at most
+    ``lookahead`` following words are fetched in background threads, so the
+    next word is usually ready by the time the user moves on. Calling
+    ``cancel`` drops every pending fetch; requests already in flight finish
+    in the background and their results are discarded.
+    """
+
+    def __init__(self, fetch, words: List[str], lookahead: int = 2):
+        self.fetch = fetch
+        self.words = list(words)
+        self.lookahead = max(1, lookahead)
+        self.executor = ThreadPoolExecutor(max_workers=self.lookahead, thread_name_prefix="word-prefetch")
+        self.futures: Dict[int, Future] = {}
+        self.next_index = 0
+        self.cancelled = threading.Event()
+
+    def _fetch_unless_cancelled(self, word: str) -> str:
+        if self.cancelled.is_set():
+            return ""
+        return self.fetch(word)
+
+    def _fill(self):
+        # Keep the current word plus up to `lookahead` words submitted.
+        upper = min(len(self.words), self.next_index + self.lookahead)
+        for index in range(self.next_index, upper):
+            if index not in self.futures:
+                self.futures[index] = self.executor.submit(self._fetch_unless_cancelled, self.words[index])
+
+    def __iter__(self):
+        """Yields ``(word, response, error)`` for each queued word, in order."""
+        while self.next_index < len(self.words) and not self.cancelled.is_set():
+            index = self.next_index
+            self._fill()
+            future = self.futures.pop(index)
+            self.next_index += 1
+            # Start the next lookahead fetch before blocking on the current one.
+            self._fill()
+            try:
+                yield self.words[index], future.result(), None
+            except Exception as e:
+                yield self.words[index], "", e
+
+    def remaining(self) -> List[str]:
+        return self.words[self.next_index:]
+
+    def cancel(self):
+        self.cancelled.set()
+        for future in self.futures.values():
+            future.cancel()
+        self.futures.clear()
+        self.executor.shutdown(wait=False)
+
+
 class FrenchVocabBuilder:
     DEFAULT_FILENAME = "FrenchVocab.tex"
+    # Below this many changed entries, rendering inline beats starting a process pool.
+    PARALLEL_RENDER_THRESHOLD = 2000
+    RENDER_CHUNK_SIZE = 1000
+    AI_MODEL = "claude-3-5-sonnet-20240620"
+    # Output budget bounds; the actual max_tokens is derived from the usage log.
+    MAX_OUTPUT_TOKENS = 8192
+    MIN_OUTPUT_TOKENS = 512
+    MIN_USAGE_SAMPLES = 5
+    # USD per million tokens, used for the session cost report.
+    TOKEN_PRICES = {
+        "input_tokens": 3.00,
+        "output_tokens": 15.00,
+        "cache_creation_input_tokens": 3.75,
+        "cache_read_input_tokens": 0.30,
+    }
     def __init__(self, latex_file: str):
         init_start = time.time()
         
@@ -44,15 +185,41 @@ class FrenchVocabBuilder:
             self.latex_file = os.path.join(os.getcwd(), self.DEFAULT_FILENAME)
         else:
             self.latex_file = latex_file
-        if not os.path.exists(self.latex_file):
+        self.store_file = os.path.splitext(self.latex_file)[0] + ".db"
+        new_store = not os.path.exists(self.store_file)
+        if not os.path.exists(self.latex_file) and new_store:
             self.create_initial_tex_file()
         self.max_word_length = 100
-        self.word_entries: Dict[str, Dict] = {}
+        self.queue_lookahead = 2
+        self.word_entries: Dict[str, VocabEntry] = {}
+        # Secondary indexes over word_entries keys, maintained by index_entry.
+        self.entries_by_type: Dict[WordType, Set[str]] = {word_type: set() for word_type in WordType}
+        self.entries_by_letter: Dict[str, Set[str]] = {}
         self.normalized_entries: Dict[str, str] = {}
+        self.spell_suggester: Optional[SpellSuggester] = None
+        # Guards building the suggester against words being indexed meanwhile (service threads).
+        self.spell_suggester_lock = threading.Lock()
         self.config_file = "vocab_builder_config.json"
         self.client = None
+        self.transport: Optional[PooledTransport] = None
+        # Set when the warm-up request is rejected, so queries fail fast instead of each retrying.
+        self.api_key_error: Optional[str] = None
         self.client_lock = threading.Lock()
         self.client_initialized = threading.Event()
+        self.usage_lock = threading.Lock()
+        self.prompt_cache_stats = {
+            "calls": 0,
+            "hits": 0,
+            "input_tokens": 0,
+            "cache_read_input_tokens": 0,
+            "cache_creation_input_tokens": 0,
+            "hit_seconds": 0.0,
+            "miss_seconds": 0.0,
+        }
+        self.last_usage: Optional[Dict] = None
+        self.usage_log_file = "ai_usage_log.jsonl"
+        self.session_usage: List[Dict] = []
+        self.output_token_history: Optional[Dict[WordType, List[int]]] = None
         
         self.load_config()
         if 'ANTHROPIC_API_KEY' not in os.environ:
@@ -65,12 +232,31 @@ class FrenchVocabBuilder:
         self.load_config()
         load_config_end = time.time()
         
+        # Background PDF builds are opt-in, since they need a local TeX install.
+        self.pdf_builder: Optional[PdfBuilder] = None
+        if os.environ.get("FRENCH_VOCAB_AUTO_PDF", "").lower() in ("1", "true", "yes"):
+            self.pdf_builder = PdfBuilder(self.latex_file)
+            if not self.pdf_builder.available:
+                self.console.print("[yellow]latexmk not found; background PDF builds are disabled.[/yellow]")
+
         load_entries_start = time.time()
-        self.load_existing_entries()
+        self.store = VocabStore(self.store_file)
+        self.last_entry_id = 0
+        # Serializes rewrites of the .tex file with other running instances.
+        self.write_lock = FileLock(self.latex_file + ".lock")
+        if new_store:
+            self.import_existing_entries()
+        else:
+            self.load_entries_from_store()
+        if not os.path.exists(self.latex_file) or self.store.count_unrendered():
+            self.build_latex()
+        elif self.pdf_builder and self.pdf_builder.is_stale():
+            self.pdf_builder.notify_changed()
         load_entries_end = time.time()
         
         self.exported_words_file = "exported_words.json"
         self.exported_words = self.load_exported_words()
+        self.import_stats()
         self.entry_count = self.count_entries()
 
         init_end = time.time()
@@ -147,7 +333,9 @@ class FrenchVocabBuilder:
         try:
             api_key = os.environ.get('ANTHROPIC_API_KEY')
             if api_key and api_key.startswith("sk-ant") and len(api_key) >= 32:
-                self.client = anthropic.Anthropic(api_key=api_key)
+                # One pooled transport for every call, so connections are reused across queries.
+                self.transport = PooledTransport.from_env()
+                self.client = anthropic.Anthropic(api_key=api_key, http_client=self.transport.client)
                 self.console.print("[bold green]Anthropic client initialized successfully![/bold green]")
             else:
                 self.console.print("[bold red]Invalid or missing ANTHROPIC_API_KEY in environment variables.[/bold red]")
@@ -158,6 +346,29 @@ class FrenchVocabBuilder:
             self.provide_api_key_instructions()
         finally:
             self.client_initialized.set()
+        if self.client and os.environ.get("FRENCH_VOCAB_WARMUP", "").lower() in ("1", "true", "yes"):
+            self.warm_up_client()
+
+    def warm_up_client(self):
+        """Opens a pooled connection and checks the API key with a one-token request.
+
+        Runs in the background before the first query, so that query finds
+        an open connection, and a rejected key is reported up front instead
+        of after a full failed request.
+        """
+        try:
+            with self.transport.labelled("warm-up"):
+                self.client.messages.create(
+                    model=self.AI_MODEL,
+                    max_tokens=1,
+                    messages=[{"role": "user", "content": "Hi"}],
+                )
+        except anthropic.AuthenticationError as e:
+            self.api_key_error = (f"The Anthropic API rejected the API key (HTTP {e.status_code}). "
+                                  "Check ANTHROPIC_API_KEY or the key stored in the keyring.")
+            self.console.print(f"[bold red]{self.api_key_error}[/bold red]")
+        except anthropic.APIError as e:
+            self.console.print(f"[yellow]AI warm-up request failed: {e}[/yellow]")
 
     def provide_api_key_instructions(self):
         instructions = """
@@ -197,89 +408,266 @@ class FrenchVocabBuilder:
             json.dump(list(self.exported_words), f)
 
     def count_entries(self) -> int:
-        try:
-            with open(self.latex_file, "r", encoding="utf-8") as file:
-                content = file.read()
-            return len(re.findall(r"\\entry\{", content))
-        except FileNotFoundError:
-            console.print(f"[bold red]Error: File not found - {self.latex_file}[/bold red]")
-            return 0
-        except IOError as e:
-            console.print(f"[bold red]Error reading file: {e}[/bold red]")
-            return 0
+        # Maintained by the store on every insert, so this does not read the .tex file.
+        return int(self.store.stat("entries"))
 
+    def import_stats(self):
+        """Seeds the statistics that predate the store's running totals, once per store.
 
-    def load_existing_entries(self):
-        """Loads existing vocabulary entries from the LaTeX file.
+        Entry counts are rebuilt by the store itself; API spend comes from the
+        usage log and export coverage from the exported words file.
+        """
+        if self.store.get_meta("usage_stats_imported") is None:
+            updates = []
+            if os.path.exists(self.usage_log_file):
+                with open(self.usage_log_file, "r", encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            record = json.loads(line)
+                        except json.JSONDecodeError:
+                            continue
+                        updates.extend(self.usage_stats(record))
+            self.store.add_stats(updates)
+            self.store.set_meta("usage_stats_imported", "1")
+        if self.store.get_meta("export_stats_imported") is None:
+            exported = len(self.exported_words & set(self.word_entries))
+            self.store.add_stats([("exported_entries", "", exported)])
+            self.store.set_meta("export_stats_imported", "1")
+
+    def usage_stats(self, record: Dict) -> List[Tuple[str, str, float]]:
+        """Running-total updates for one usage log record."""
+        month = time.strftime("%Y-%m", time.localtime(record.get("timestamp", time.time())))
+        cost = self.usage_cost(record)
+        return [("api_calls", "", 1), ("api_cost", "", cost), ("api_cost_by_month", month, cost)] + [
+            ("api_tokens", field, record.get(field, 0)) for field in self.TOKEN_PRICES
+        ]
+
+
+    def load_existing_entries(self) -> Tuple[List[Tuple], int]:
+        """Reads every \\entry block of the LaTeX file as a store row.
+
+        Each block becomes its own row, so words added twice with "Force Add"
+        stay separate entries, and the word keeps its original casing. The
+        block's original text is kept as the row's rendering, so importing does
+        not reformat the file. Blocks that cannot be split into their four
+        arguments are kept verbatim: they are never re-rendered, and their word
+        is a best guess.
 
-        This method reads the LaTeX file, extracts vocabulary entries, and populates
-        the word_entries and normalized_entries dictionaries. It ensures that only valid
-        entries with non-empty fields are added.
+        Returns:
+            Tuple: The (word, sort_key, word_type, definitions, examples,
+                rendered, verbatim) rows, and the number of "\\entry{" in the file.
 
         Raises:
             FileNotFoundError: If the LaTeX file does not exist.
             IOError: If there is an error reading the file.
         """
-        with open(self.latex_file, "r", encoding="utf-8") as file:
+        with open(self.latex_file, "rb") as file:
             content = file.read()
 
-        entries = re.findall(
-            r"\\entry\{(.*?)\}\{(.*?)\}\s*\{(.*?)\}\s*\{(.*?)\}", content, re.DOTALL
-        )
-        for word, word_type, definitions, examples in entries:
-            word = word.strip().lower()  # Normalize the word
-            
-            # Check for empty entries
-            if not word or not word_type or not definitions.strip() or not examples.strip():
-                console.print(f"[bold yellow]Skipping incomplete entry for word: '{word}'[/bold yellow]")
+        chunks, _ = split_chunks(content)
+        rows = []
+        for _, data in chunks:
+            text = data.decode("utf-8", errors="replace").rstrip()
+            groups, unmatched, unclosed = brace_groups(text)
+            spans = entry_spans(text, groups) if unmatched is None and not unclosed else None
+            if spans is None or text[spans[-1][1] + 1:].strip():
+                word = text[groups[0][0]:groups[0][1]].strip() if groups else ""
+                console.print(f"[bold yellow]Keeping unparsed entry as written: '{word}'[/bold yellow]")
+                rows.append((word, self.normalize_word(word), "", [], [], text, True))
                 continue
-            
-            self.word_entries[word] = {
-                "word": word,
-                "type": word_type,
-                "definitions": definitions.strip(),
-                "examples": examples.strip(),
-            }
+            word, word_type, definitions, examples = (text[start:end] for start, end in spans)
+            word = word.strip()
+            rows.append((
+                word,
+                self.normalize_word(word),
+                # Older entries were written with the word type list repr, e.g. 'verb'
+                word_type.strip().strip("'\""),
+                split_latex_items(definitions),
+                [split_latex_example(e) for e in split_latex_items(examples)],
+                text,
+                False,
+            ))
+        return rows, content.count(ENTRY_START)
+
+    def initial_letter(self, word: str) -> str:
+        letter = self.normalize_word(word)[:1].upper()
+        return letter if letter.isalpha() else "#"
+
+    def index_entry(self, word: str, entry: VocabEntry):
+        """Stores an entry in word_entries and keeps the secondary indexes in step."""
+        previous = self.word_entries.get(word)
+        if previous is not None:
+            self.entries_by_type[previous.word_type].discard(word)
+        self.word_entries[word] = entry
+        self.entries_by_type[entry.word_type].add(word)
+        self.entries_by_letter.setdefault(self.initial_letter(word), set()).add(word)
+
+    def parse_word_types(self, labels) -> Set[WordType]:
+        """Maps free-form word type labels (e.g. from a prompt or request) onto WordType."""
+        return {classify_word_type(label) for label in labels if label.strip()}
+
+    def unknown_word_types(self, labels) -> List[str]:
+        """Returns the labels that name no word type (they would map onto OTHER without asking for it)."""
+        return [
+            label for label in labels
+            if label.strip() and label.strip().lower() != "other" and classify_word_type(label) is WordType.OTHER
+        ]
+
+    def words_of_type(self, label: str) -> Set[str]:
+        return self.entries_by_type[classify_word_type(label)]
+
+    def import_existing_entries(self):
+        """One-time import of the LaTeX file into the vocabulary store.
+
+        Runs when no store exists yet. After this the store is the source of
+        truth and the LaTeX file is regenerated from it by build_latex. The
+        file is copied to a .bak file first, since the next build rewrites it.
+        """
+        if os.path.exists(self.latex_file):
+            backup_file = self.latex_file + ".bak"
+            shutil.copy2(self.latex_file, backup_file)
+            rows, entries_in_file = self.load_existing_entries()
+        else:
+            backup_file, rows, entries_in_file = None, [], 0
+        self.store.import_entries(rows)
+        # The rows carry their original text, which is current for this render version.
+        self.store.set_meta("render_version", LATEX_RENDER_VERSION)
+        self.load_entries_from_store()
+        self.console.print(f"[bold green]Imported {len(rows)} entries into {self.store_file}[/bold green]")
+        if len(rows) != entries_in_file:
+            self.console.print(
+                f"[bold red]{self.latex_file} has {entries_in_file} \\entry commands but only {len(rows)} were "
+                f"imported (entries outside the entries list are not kept). The original is saved as "
+                f"{backup_file}.[/bold red]"
+            )
+
+    def load_entries_from_store(self):
+        for entry in self.store.entries():
+            self.load_store_entry(entry)
+
+    def load_store_entry(self, entry: Dict):
+        self.last_entry_id = max(self.last_entry_id, entry["id"])
+        word = entry["word"].lower()
+        if not word:
+            return
+        self.index_entry(word, VocabEntry(
+            entry["word"], entry["type"], entry["definitions"], entry["examples"]
+        ))
+        normalized_word = self.normalize_word(word)
+        self.normalized_entries[normalized_word] = word
+        self.index_spelling(normalized_word)
+
+    def refresh_entries(self) -> int:
+        """Loads entries that other processes have added to the store since the last refresh.
+
+        Returns:
+            int: The number of entries loaded (including this process's own
+                recent additions, which are simply re-indexed).
+        """
+        new_entries = self.store.entries_since(self.last_entry_id)
+        for entry in new_entries:
+            self.load_store_entry(entry)
+        return len(new_entries)
+
+    def read_tex_frame(self) -> Tuple[str, str]:
+        """Returns the LaTeX before and after the entries list.
+
+        Keeps any preamble edits made to an existing file; falls back to the
+        default templates if the file is missing or its markers are not found.
+        """
+        default = (INITIAL_TEX_CONTENT, FINAL_TEX_CONTENT.lstrip("\n"))
+        try:
+            with open(self.latex_file, "r", encoding="utf-8") as file:
+                content = file.read()
+        except FileNotFoundError:
+            return default
+        entries_start = content.find(ENTRIES_BEGIN)
+        entries_end = content.rfind(ENTRIES_END)
+        if entries_start == -1 or entries_end == -1:
+            return default
+        return content[:entries_start + len(ENTRIES_BEGIN)], content[entries_end:]
+
+    def render_entries(self, rows: List[Tuple]) -> List[Tuple[int, str]]:
+        """Renders store rows to LaTeX, spreading large batches over a process pool."""
+        if len(rows) < self.PARALLEL_RENDER_THRESHOLD:
+            return render_entries_chunk(rows)
+        chunks = [rows[i:i + self.RENDER_CHUNK_SIZE] for i in range(0, len(rows), self.RENDER_CHUNK_SIZE)]
+        rendered: List[Tuple[int, str]] = []
+        with ProcessPoolExecutor() as executor:
+            for chunk in executor.map(render_entries_chunk, chunks):
+                rendered.extend(chunk)
+        return rendered
+
+    def build_latex(self) -> None:
+        """Regenerates the LaTeX file from the vocabulary store.
+
+        Only entries added or changed since the last build are rendered; the
+        rest come from the store's cached renderings. Entries are written in
+        alphabetical order, and the file is replaced atomically and only if
+        its content actually changed.
+
+        The rewrite holds an advisory lock shared with other instances. Entries
+        that other processes committed to the store while this one waited for
+        the lock are included, so concurrent inserts are merged into a single
+        rewrite; a process that finds its entries already written skips its own.
+        """
+        with self.write_lock:
+            if self.write_lock.last_wait:
+                console.print(f"[dim]Waited {self.write_lock.last_wait:.2f}s for another writer.[/dim]")
+
+            # Read before rendering: anything committed later bumps the version and gets its own build.
+            version = str(self.store.content_version())
+            render_version_changed = self.store.get_meta("render_version") != LATEX_RENDER_VERSION
+            if (not render_version_changed and self.store.get_meta("built_version") == version
+                    and os.path.exists(self.latex_file) and not self.store.count_unrendered()):
+                return
+
+            if render_version_changed:
+                self.store.invalidate_rendered()
+                self.store.set_meta("render_version", LATEX_RENDER_VERSION)
+
+            pending = self.store.unrendered()
+            if pending:
+                self.store.set_rendered(self.render_entries(pending))
+
+            header, footer = self.read_tex_frame()
+            content = header + "\n" + "".join(entry + "\n\n" for entry in self.store.rendered_entries()) + footer
+
+            try:
+                with open(self.latex_file, "r", encoding="utf-8") as file:
+                    unchanged = file.read() == content
+            except FileNotFoundError:
+                unchanged = False
+
+            if not unchanged:
+                try:
+                    temp_file = f"{self.latex_file}.{os.getpid()}.tmp"
+                    with open(temp_file, "w", encoding="utf-8") as file:
+                        file.write(content)
+                    os.replace(temp_file, self.latex_file)
+                    console.print(f"[bold green]Rebuilt {self.latex_file} ({len(pending)} entries rendered).[/bold green]")
+                except IOError as e:
+                    console.print(f"[bold red]Error writing LaTeX file: {e}[/bold red]")
+                    return
+            self.store.set_meta("built_version", version)
 
-        # Print all extracted entries
-        console.print("[bold blue]Entries extracted in load_existing_entries:")
-        for word, entry in self.word_entries.items():
-            normalized_word = self.normalize_word(word)
-            self.normalized_entries[normalized_word] = word
+        if self.pdf_builder and not unchanged:
+            self.pdf_builder.notify_changed()
 
-    def latex_to_anki_format(self, text):
-        """Converts LaTeX-formatted text to Anki-compatible HTML format.
+    def latex_to_anki_format(self, items: Sequence[str]) -> str:
+        """Converts a list of LaTeX-formatted items to Anki-compatible HTML format.
 
-        This method processes a given LaTeX string by removing LaTeX-specific
-        commands, converting newlines to HTML line breaks, and formatting
-        list items with bullet points suitable for Anki flashcards.
+        This method removes any LaTeX-specific commands from each item and
+        formats the items with bullet points suitable for Anki flashcards.
 
         Args:
-            text (str): The LaTeX-formatted string to be converted.
+            items (Sequence[str]): The LaTeX-formatted items to be converted.
 
         Returns:
-            str: The converted string formatted with HTML line breaks and
-                 bullet points, ready for Anki import.
+            str: The items formatted with HTML line breaks and bullet points,
+                 ready for Anki import.
         """
-        # Remove LaTeX item markers
-        text = re.sub(r'\\item\s*', '', text)
-        
-        # Convert LaTeX newlines to HTML line breaks
-        text = text.replace('\\\\ ', '<br>')
-        
-        # Remove any remaining LaTeX commands
-        text = re.sub(r'\\[a-zA-Z]+(\[.*?\])?(\{.*?\})?', '', text)
-        
-        # Split the text into individual items
-        items = [item.strip() for item in text.split('\n') if item.strip()]
-        
-        # Add bullet points to each item
-        formatted_items = [f'• {item}' for item in items]
-        
-        # Join the items with HTML line breaks
-        formatted_text = '<br>'.join(formatted_items)
-        
-        return formatted_text.strip()
+        return latex_items_to_html(items)
 
     def normalize_word(self, word: str) -> str:
         """Normalize a given word by converting it to lowercase and removing accents.
@@ -297,21 +685,43 @@ class FrenchVocabBuilder:
         word = word.lower().strip()
         return ''.join(c for c in unicodedata.normalize('NFD', word) if unicodedata.category(c) != 'Mn')
 
-    def export_to_anki(self, deck_name: str = "French Vocabulary"):
-        """Exports the French vocabulary entries to an Anki deck.
+    def export_to_anki(
+            self,
+            deck_name: str = "French Vocabulary",
+            word_types: Optional[Set[WordType]] = None,
+            partition_by: Optional[str] = None,
+    ) -> Dict[str, int]:
+        """Exports the French vocabulary entries to one or more Anki decks.
 
-        This method creates an Anki deck using the genanki library by iterating over
+        This method creates Anki decks using the genanki library by iterating over
         the current vocabulary entries, formatting each entry into an Anki note, and
-        adding it to the deck. Only words that have not been exported before are
+        adding it to its deck. Only words that have not been exported before are
         included to avoid duplicates.
 
+        Filtering and partitioning use the secondary indexes, so entries are
+        selected without scanning or comparing word types, and all decks are
+        filled in a single pass. The .apkg files are then written concurrently.
+
         Args:
             deck_name (str, optional): The name of the Anki deck to be created.
-                Defaults to "French Vocabulary".
+                Defaults to "French Vocabulary". Partitioned decks are named
+                "<deck_name> - <partition>".
+            word_types (Set[WordType], optional): Only export entries of these
+                types. Defaults to all types.
+            partition_by (str, optional): "type" or "letter" to write one deck
+                per word type or initial letter. Defaults to a single deck.
+
+        Returns:
+            Dict[str, int]: Number of new notes in each .apkg file written.
 
         Raises:
+            ValueError: If deck_name is not a plain file name (see validate_deck_name).
             IOError: If there's an error writing the Anki package file.
         """
+        # The deck name becomes the file name, so it must not point outside the working directory.
+        error = self.validate_deck_name(deck_name)
+        if error:
+            raise ValueError(error)
         model_id = random.randrange(1 << 30, 1 << 31)
         # Define the model for Anki notes
         model = genanki.Model(
@@ -331,10 +741,22 @@ class FrenchVocabBuilder:
                 },
             ])
 
-        # Generate a unique deck ID
-        deck_id = random.randrange(1 << 30, 1 << 31)
-        # Create a new Anki deck with the specified name and ID
-        deck = genanki.Deck(deck_id, deck_name)
+        # Map each partition name to the words it holds, straight from the indexes
+        selected_types = word_types if word_types else set(WordType)
+        if partition_by == "type":
+            partitions = {
+                word_type.name.replace("_", " ").title(): self.entries_by_type[word_type]
+                for word_type in selected_types
+            }
+        else:
+            selected_words = set().union(*(self.entries_by_type[t] for t in selected_types))
+            if partition_by == "letter":
+                partitions = {
+                    letter: words & selected_words
+                    for letter, words in self.entries_by_letter.items()
+                }
+            else:
+                partitions = {None: selected_words}
 
         # Create sets for all words in LaTeX and all words ever exported to Anki
         latex_words = set(self.word_entries.keys())
@@ -342,45 +764,60 @@ class FrenchVocabBuilder:
 
         # Set to keep track of newly added words in this export
         newly_added_words = set()
-
-        # Iterate over all word entries
-        for word, entry in self.word_entries.items():
-            # Normalize the word by stripping whitespace and converting to lowercase
-            word = word.strip().lower()
-
-            # Check if the word has already been exported to Anki
-            if word not in all_exported_words:
-                # Ensure word_type is always a string
-                word_type = ', '.join(entry['type']) if isinstance(entry['type'], list) else entry['type']
-
+        decks: Dict[str, genanki.Deck] = {}
+
+        # Single pass over the selected words, filling every deck at once
+        for partition, words in sorted(partitions.items(), key=lambda item: item[0] or ""):
+            for word in sorted(words - all_exported_words):
+                entry = self.word_entries[word]
+                name = f"{deck_name} - {partition}" if partition else deck_name
+                if name not in decks:
+                    # Generate a unique deck ID
+                    decks[name] = genanki.Deck(random.randrange(1 << 30, 1 << 31), name)
                 # Create a new Anki note with the formatted fields
                 note = genanki.Note(
                     model=model,
                     fields=[
-                        entry['word'],
-                        word_type,
-                        self.latex_to_anki_format(entry['definitions']),
-                        self.latex_to_anki_format(entry['examples']),
+                        entry.word,
+                        entry.type_label,
+                        self.latex_to_anki_format(entry.definitions),
+                        self.latex_to_anki_format([f"{french}<br>({english})" for french, english in entry.examples]),
                     ])
                 # Add the note to the deck
-                deck.add_note(note)
+                decks[name].add_note(note)
                 # Mark the word as exported
                 all_exported_words.add(word)
                 # Add the word to the set of newly added words
                 newly_added_words.add(word)
 
-        # Write the deck to a .apkg file
-        genanki.Package(deck).write_to_file(f'{deck_name}.apkg')
+        if not decks and partition_by is None:
+            # Keep the previous behaviour of always writing the requested deck
+            decks[deck_name] = genanki.Deck(random.randrange(1 << 30, 1 << 31), deck_name)
+
+        # Write the decks to .apkg files concurrently
+        with ThreadPoolExecutor(max_workers=min(8, max(1, len(decks)))) as executor:
+            list(executor.map(
+                lambda deck: genanki.Package(deck).write_to_file(f'{deck.name}.apkg'),
+                decks.values(),
+            ))
 
         # Update the exported_words set and save it
         self.exported_words = all_exported_words
         self.save_exported_words()
+        self.store.add_stats([("exported_entries", "", len(newly_added_words)), ("anki_exports", "", 1)])
+        self.store.set_meta("last_anki_export", str(time.time()))
 
         # Prepare the feedback message for the user
+        packages = "\n".join(
+            f"        [bold green]'{name}.apkg'[/bold green]: {len(deck.notes)} new words"
+            for name, deck in sorted(decks.items())
+        ) or "        No decks written: no new words matched."
         feedback = f"""
-        [bold green]Anki deck '{deck_name}.apkg' created successfully![/bold green]
+        [bold green]Anki export finished![/bold green]
+
+{packages}
 
-        [bold blue]Total words in deck: {len(all_exported_words)}[/bold blue]
+        [bold blue]Total words exported so far: {len(all_exported_words)}[/bold blue]
         [bold cyan]Newly added words in this export: {len(newly_added_words)}[/bold cyan]
 
         New words added:
@@ -401,13 +838,99 @@ class FrenchVocabBuilder:
 
         # Display the feedback in a styled panel using Rich
         self.console.print(Panel(feedback, title="Export Summary", expand=False, border_style="green"))
+        return {f"{name}.apkg": len(deck.notes) for name, deck in decks.items()}
 
     def check_duplicate(self, word: str) -> Optional[str]:
         normalized_word = self.normalize_word(word)
         return self.normalized_entries.get(normalized_word)
 
-    def handle_duplicate(self, word: str, existing_word: str) -> bool:
-        warning_text = Text(f"Warning: '{word}' already exists in the dictionary as '{existing_word}'.", style="bold yellow")
+    def get_spell_suggester(self) -> SpellSuggester:
+        # Built on first use so it does not add to startup time. Words indexed
+        # while it is built wait for the lock in index_spelling, so none is missed.
+        with self.spell_suggester_lock:
+            if self.spell_suggester is None:
+                self.spell_suggester = SpellSuggester(list(self.normalized_entries))
+            return self.spell_suggester
+
+    def index_spelling(self, normalized_word: str):
+        """Adds a new word to the spell suggester, if it has been built."""
+        with self.spell_suggester_lock:
+            if self.spell_suggester is not None:
+                self.spell_suggester.add(normalized_word)
+
+    def resolve_word_locally(self, word: str) -> Optional[Tuple[str, str]]:
+        """Finds a known entry that word may be a conjugated or inflected form of.
+
+        Runs before any AI request: the input is reduced to candidate lemmas
+        with the bundled French lemma table, which are matched against
+        normalized_entries only, so no network call is needed. A candidate
+        derived by a verb rule only matches a verb entry, and one derived by a
+        noun or adjective rule only matches other entries.
+
+        Only advice, like suggest_spelling: the rules overgenerate, so
+        "livre" resolves to "livrer" although it is a word of its own.
+
+        Args:
+            word (str): The word as entered by the user.
+
+        Returns:
+            Optional[Tuple[str, str]]: The existing word and a short explanation,
+                or None if the word does not resolve to a known entry.
+        """
+        normalized_word = self.normalize_word(word)
+        for candidate, verb in lemma_candidates(normalized_word):
+            existing_word = self.normalized_entries.get(candidate)
+            if not existing_word:
+                continue
+            is_verb = self.word_entries[existing_word.lower()].word_type in (WordType.VERB, WordType.PRONOMINAL_VERB)
+            if verb == is_verb:
+                return existing_word, f"'{word}' looks like a form of '{existing_word}'"
+        return None
+
+    def suggest_spelling(self, word: str) -> Optional[Tuple[str, str]]:
+        """Finds a known entry one or two edits away from word.
+
+        Only advice: plenty of distinct words are one letter apart ("pain" and
+        "main", "chanter" and "chanteur"), so a match must not stop the word
+        from being added.
+
+        Returns:
+            Optional[Tuple[str, str]]: The closest existing word and a short
+                explanation, or None if no known word is close.
+        """
+        suggestions = self.get_spell_suggester().suggest(self.normalize_word(word))
+        if not suggestions:
+            return None
+        existing_word = self.normalized_entries[suggestions[0]]
+        return existing_word, f"'{word}' may be a misspelling of '{existing_word}'"
+
+    def find_existing_entry(self, word: str) -> Optional[Tuple[str, Optional[str]]]:
+        """Returns the entry word duplicates, as (existing word, None), or None."""
+        existing_word = self.check_duplicate(word)
+        if existing_word:
+            return existing_word, None
+        return None
+
+    def suggest_existing_entry(self, word: str) -> Optional[Tuple[str, str]]:
+        """Returns a known entry word may be a form or misspelling of, with an explanation."""
+        return self.resolve_word_locally(word) or self.suggest_spelling(word)
+
+    def confirm_new_word(self, word: str) -> bool:
+        """Checks word against the vocabulary before querying the AI; False if the user skips it."""
+        existing = self.find_existing_entry(word)
+        if existing:
+            return self.handle_duplicate(word, *existing)
+        suggestion = self.suggest_existing_entry(word)
+        if suggestion:
+            return self.handle_duplicate(word, *suggestion, likely_duplicate=False)
+        return True
+
+    def handle_duplicate(self, word: str, existing_word: str, reason: Optional[str] = None,
+                         likely_duplicate: bool = True) -> bool:
+        if reason:
+            warning_text = Text(f"Warning: {reason}, which is already in the dictionary.", style="bold yellow")
+        else:
+            warning_text = Text(f"Warning: '{word}' already exists in the dictionary as '{existing_word}'.", style="bold yellow")
         self.console.print(Panel(warning_text, border_style="yellow"))
 
         # Create a table for options
@@ -420,7 +943,8 @@ class FrenchVocabBuilder:
 
         self.console.print(Panel(table, title="Please choose an action", border_style="blue"))
 
-        choice = Prompt.ask("Your choice", choices=["s", "v", "f"], default="s")
+        # Spelling suggestions are only advice, so Enter adds the word anyway.
+        choice = Prompt.ask("Your choice", choices=["s", "v", "f"], default="s" if likely_duplicate else "f")
 
         if choice == "s":
             self.console.print(Panel("Skipping this word. Returning to main menu.", border_style="green"))
@@ -436,8 +960,7 @@ class FrenchVocabBuilder:
 
     def display_existing_entry(self, word: str):
         entry = self.word_entries[word.lower()]
-        self.display_parsed_info(entry['word'], [entry['type']], entry['definitions'].split('; '),
-                                 [tuple(e.split(' (', 1)) for e in entry['examples'].split('; ')])
+        self.display_parsed_info(entry.word, [entry.type_label], entry.definitions, entry.examples)
 
     
     def welcome_screen(self):
@@ -457,27 +980,32 @@ class FrenchVocabBuilder:
     def show_menu(self):
         console.print("\n[bold cyan]Menu Options:[/bold cyan]")
         console.print("1. Add a new word")
-        console.print("2. Export to Anki deck")
-        console.print("3. Reconcile LaTeX and Anki exports")
-        console.print("4. Exit")
+        console.print("2. Add several words (queue)")
+        console.print("3. Export (Anki deck, TSV, CSV or JSONL)")
+        console.print("4. Reconcile LaTeX and Anki exports")
+        console.print("5. Statistics")
+        console.print("6. Exit")
         console.print(f"[bold green]Current word count: {self.entry_count}[/bold green]")
-        choice = Prompt.ask("Choose an option", choices=["1", "2", "3", "4"])
+        if self.pdf_builder:
+            console.print(self.pdf_builder.status_line())
+        choice = Prompt.ask("Choose an option", choices=["1", "2", "3", "4", "5", "6"])
         return choice
 
-    def generate_table(self, search_term: str, results: dict) -> Table:
+    def generate_table(self, search_term: str, results: Dict[str, VocabEntry]) -> Table:
         table = Table(title=f"Search Results for: {search_term}")
         table.add_column("Word", style="cyan")
         table.add_column("Type", style="magenta")
         table.add_column("Definitions", style="green")
 
         for word, entry in results.items():
+            definitions = "; ".join(entry.definitions)
             table.add_row(
-                entry["word"],
-                entry["type"],
+                entry.word,
+                entry.type_label,
                 (
-                    entry["definitions"][:50] + "..."
-                    if len(entry["definitions"]) > 50
-                    else entry["definitions"]
+                    definitions[:50] + "..."
+                    if len(definitions) > 50
+                    else definitions
                 ),
             )
 
@@ -494,17 +1022,64 @@ class FrenchVocabBuilder:
             # Normalize apostrophes
             word = word.replace("’", "'")
             
-            if len(word.split()) > 10:
-                self.console.print("[bold red]Error: Please enter a single word or short expression (max {self.max3_word_length} words).[/bold red]")
-            elif len(word) > self.max_word_length:
-                self.console.print(f"[bold red]Error: Input is too long. Please limit to {self.max_word_length} characters.[/bold red]")
-            elif not word:
-                self.console.print("[bold red]Error: Input cannot be empty.[/bold red]")
-            elif not self.is_valid_french_input(word):
-                self.console.print("[bold red]Error: Input contains invalid characters for French words.[/bold red]")
+            error = self.validate_word_input(word)
+            if error:
+                self.console.print(f"[bold red]Error: {error}[/bold red]")
             else:
                 return word
 
+    def validate_word_input(self, word: str) -> Optional[str]:
+        """Returns an error message if the word cannot be queried, otherwise None."""
+        if len(word.split()) > 10:
+            return "Please enter a single word or short expression (max 10 words)."
+        elif len(word) > self.max_word_length:
+            return f"Input is too long. Please limit to {self.max_word_length} characters."
+        elif not word:
+            return "Input cannot be empty."
+        elif not self.is_valid_french_input(word):
+            return "Input contains invalid characters for French words."
+        return None
+
+    def validate_deck_name(self, deck_name: str) -> Optional[str]:
+        """Returns an error message if the deck name cannot be used as an .apkg file name, otherwise None."""
+        if not deck_name.strip():
+            return "Deck name cannot be empty."
+        elif any(separator in deck_name for separator in ("/", "\\", "\0")) or ".." in deck_name:
+            return "Deck name cannot contain '/', '\\' or '..'."
+        return None
+
+    def get_word_queue_input(self) -> List[str]:
+        """Prompts for several words up front and returns the ones to be queried.
+
+        Words may be entered one per line or comma-separated on a line. Known
+        duplicates are resolved here, before any AI request is made, so the
+        queue itself never has to stop for a duplicate prompt.
+        """
+        self.console.print("\nEnter French words or short expressions, one per line (or comma-separated).")
+        self.console.print("Press Enter on an empty line to start the queue, or 'q' to cancel.")
+        words: List[str] = []
+        while True:
+            line = input(f"Word {len(words) + 1}: ").strip()
+            if line.lower() == 'q':
+                self.console.print("[yellow]Input cancelled. Returning to main menu.[/yellow]")
+                return []
+            if not line:
+                break
+            for word in line.split(','):
+                word = word.strip().replace("’", "'")
+                if not word:
+                    continue
+                error = self.validate_word_input(word)
+                if error:
+                    self.console.print(f"[bold red]Skipping '{word}': {error}[/bold red]")
+                elif self.normalize_word(word) in (self.normalize_word(w) for w in words):
+                    self.console.print(f"[yellow]'{word}' is already in the queue.[/yellow]")
+                else:
+                    if not self.confirm_new_word(word):
+                        continue
+                    words.append(word)
+        return words
+
     def is_valid_french_input(self, word: str) -> bool:
         # Allow letters (including accented), spaces, hyphens, and apostrophes
         return all(char.isalpha() or char.isspace() or char in "'-àâäéèêëîïôöùûüçÀÂÄÉÈÊËÎÏÔÖÙÛÜÇ" for char in word.strip())
@@ -513,29 +1088,220 @@ class FrenchVocabBuilder:
         client = self.get_anthropic_client()
         if not client:
             return "[bold red]Failed to initialize Anthropic client. Please check your API key and try again.[/bold red]"
+        if self.api_key_error:
+            console.print(f"[bold red]{self.api_key_error}[/bold red]")
+            return ""
         
-        prompt = AI_PROMPT_TEMPLATE.format(word=word)
         with Progress() as progress:
             task = progress.add_task("[cyan]Querying AI...", total=100)
 
             try:
-                message = client.messages.create(
-                    model="claude-3-5-sonnet-20240620",
-                    max_tokens=8192,
-                    temperature=0.1,
-                    messages=[
-                        {"role": "user", "content": [{"type": "text", "text": prompt}]}
-                    ],
-                    extra_headers={
-                        "anthropic-beta": "max-tokens-3-5-sonnet-2024-07-15"
-                    },
-                )
+                response = self.fetch_ai_response(word)
                 progress.update(task, advance=100)
-                return message.content[0].text
             except anthropic.APIError as e:
                 console.print(f"[bold red]Error querying AI: {e}[/bold red]")
                 return ""
 
+        usage = self.last_usage
+        if usage:
+            self.console.print(
+                f"[dim]Prompt cache: {usage['cache_read_input_tokens']} tokens read, "
+                f"{usage['cache_creation_input_tokens']} written, "
+                f"{usage['input_tokens']} uncached input ({usage['seconds']:.2f}s"
+                + (f", first byte after {usage['ttfb']:.2f}s" if usage.get("ttfb") is not None else "")
+                + ")[/dim]"
+            )
+        return response
+
+    def fetch_ai_response(self, word: str) -> str:
+        """Sends the prompt for a word to the AI and returns the raw response text.
+
+        The static instructions go in a system block marked with cache_control,
+        so repeated calls only pay for the short per-word user turn once the
+        prefix is cached. max_tokens is sized from the usage log; if a reply is
+        cut off at that budget, the request is retried with double the budget.
+        Unlike query_ai, this prints nothing and lets anthropic.APIError
+        propagate, so it can be called from the prefetch worker threads.
+        """
+        client = self.get_anthropic_client()
+        if not client:
+            raise RuntimeError("Anthropic client is not initialized")
+        if self.api_key_error:
+            raise RuntimeError(self.api_key_error)
+
+        prompt = AI_PROMPT_TEMPLATE.format(word=word)
+        max_tokens = self.max_tokens_for(word)
+        while True:
+            start = time.time()
+            message = client.messages.create(
+                model=self.AI_MODEL,
+                max_tokens=max_tokens,
+                temperature=0.1,
+                system=[
+                    {"type": "text", "text": AI_SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}
+                ],
+                messages=[
+                    {"role": "user", "content": [{"type": "text", "text": prompt}]}
+                ],
+                extra_headers={
+                    "anthropic-beta": "prompt-caching-2024-07-31,max-tokens-3-5-sonnet-2024-07-15"
+                },
+            )
+            text = message.content[0].text
+            self.record_usage(message.usage, time.time() - start, word=word, response=text,
+                              max_tokens=max_tokens, stop_reason=message.stop_reason,
+                              ttfb=self.transport.last_ttfb() if self.transport else None)
+            if message.stop_reason != "max_tokens" or max_tokens >= self.MAX_OUTPUT_TOKENS:
+                return text
+            max_tokens = min(self.MAX_OUTPUT_TOKENS, max_tokens * 2)
+
+    def guess_word_type(self, word: str) -> Optional[WordType]:
+        """Guesses the word type from the input alone, to pick a token budget.
+
+        Only verbs (by their infinitive ending) and expressions (several words)
+        can be told apart this way. Nouns, adjectives and adverbs give None and
+        share the budget pooled over all types.
+        """
+        word = self.normalize_word(word)
+        if word.startswith("se ") or word.startswith("s'"):
+            return WordType.PRONOMINAL_VERB
+        if len(word.split()) > 1:
+            return WordType.EXPRESSION
+        if word.endswith(("er", "ir", "re", "oir")):
+            return WordType.VERB
+        return None
+
+    def load_output_token_history(self) -> Dict[WordType, List[int]]:
+        history: Dict[WordType, List[int]] = {}
+        if os.path.exists(self.usage_log_file):
+            with open(self.usage_log_file, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    # Truncated replies would only ever confirm the old budget.
+                    if record.get("stop_reason") == "max_tokens":
+                        continue
+                    word_type = WordType.__members__.get(record.get("word_type"), WordType.OTHER)
+                    history.setdefault(word_type, []).append(record.get("output_tokens", 0))
+        return history
+
+    def max_tokens_for(self, word: str) -> int:
+        """Returns a max_tokens budget for the word, based on past output sizes.
+
+        Uses the 99th percentile of logged output tokens for the guessed word
+        type plus 25% headroom. Only verbs, pronominal verbs and expressions
+        can be guessed (see guess_word_type); other words, and types with too
+        few samples, use the percentile over all types. Falls back to
+        MAX_OUTPUT_TOKENS until enough calls are logged.
+        """
+        with self.usage_lock:
+            if self.output_token_history is None:
+                self.output_token_history = self.load_output_token_history()
+            history = self.output_token_history
+            samples = history.get(self.guess_word_type(word), [])
+            if len(samples) < self.MIN_USAGE_SAMPLES:
+                samples = [tokens for values in history.values() for tokens in values]
+            if len(samples) < self.MIN_USAGE_SAMPLES:
+                return self.MAX_OUTPUT_TOKENS
+            budget = int(percentile(samples, 99) * 1.25)
+        return min(self.MAX_OUTPUT_TOKENS, max(self.MIN_OUTPUT_TOKENS, budget))
+
+    def record_usage(self, usage, seconds: float, word: str = "", response: str = "",
+                     max_tokens: int = 0, stop_reason: Optional[str] = None,
+                     ttfb: Optional[float] = None) -> Dict:
+        """Records token usage and latency of one AI call.
+
+        The record is added to the session totals and appended to the local
+        usage log, which later sessions use to size max_tokens. The installed
+        SDK may not declare the prompt cache fields on its Usage model, so they
+        are read leniently and default to 0 when the API omits them.
+        """
+        word_type, _, _ = self.parse_ai_response(response)
+        word_type = classify_word_type(word_type[0] if isinstance(word_type, list) else word_type)
+        record = {
+            "timestamp": time.time(),
+            "word": word,
+            "word_type": word_type.name,
+            "input_tokens": getattr(usage, "input_tokens", 0) or 0,
+            "output_tokens": getattr(usage, "output_tokens", 0) or 0,
+            "cache_read_input_tokens": getattr(usage, "cache_read_input_tokens", 0) or 0,
+            "cache_creation_input_tokens": getattr(usage, "cache_creation_input_tokens", 0) or 0,
+            "seconds": seconds,
+            "ttfb": ttfb,
+            "max_tokens": max_tokens,
+            "stop_reason": stop_reason,
+        }
+        with self.usage_lock:
+            stats = self.prompt_cache_stats
+            stats["calls"] += 1
+            stats["input_tokens"] += record["input_tokens"]
+            stats["cache_read_input_tokens"] += record["cache_read_input_tokens"]
+            stats["cache_creation_input_tokens"] += record["cache_creation_input_tokens"]
+            if record["cache_read_input_tokens"]:
+                stats["hits"] += 1
+                stats["hit_seconds"] += seconds
+            else:
+                stats["miss_seconds"] += seconds
+            self.last_usage = record
+            self.session_usage.append(record)
+            self.store.add_stats(self.usage_stats(record))
+            if self.output_token_history is not None and stop_reason != "max_tokens":
+                self.output_token_history.setdefault(word_type, []).append(record["output_tokens"])
+            try:
+                with open(self.usage_log_file, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            except IOError as e:
+                self.console.print(f"[bold red]Error writing usage log: {e}[/bold red]")
+        return record
+
+    def usage_cost(self, record: Dict) -> float:
+        return sum(record.get(field, 0) * price for field, price in self.TOKEN_PRICES.items()) / 1_000_000
+
+    def usage_report(self) -> Optional[Table]:
+        """Summarises this session's AI calls: latency percentiles, tokens and cost."""
+        with self.usage_lock:
+            records = list(self.session_usage)
+        if not records:
+            return None
+
+        latencies = [record["seconds"] for record in records]
+        table = Table(title="AI Usage This Session")
+        table.add_column("Metric", style="cyan")
+        table.add_column("Value", style="magenta")
+        table.add_row("Calls", str(len(records)))
+        table.add_row("Truncated (retried)", str(sum(1 for r in records if r["stop_reason"] == "max_tokens")))
+        table.add_row("Latency p50 / p90 / p99",
+                      " / ".join(f"{percentile(latencies, pct):.2f}s" for pct in (50, 90, 99)))
+        ttfbs = [record["ttfb"] for record in records if record.get("ttfb") is not None]
+        if ttfbs:
+            later = f", later p50 {percentile(ttfbs[1:], 50):.2f}s" if len(ttfbs) > 1 else ""
+            table.add_row("Time to first byte", f"first call {ttfbs[0]:.2f}s{later}")
+        for field in self.TOKEN_PRICES:
+            table.add_row(field.replace("_", " ").capitalize(), str(sum(r[field] for r in records)))
+        total_cost = sum(self.usage_cost(record) for record in records)
+        table.add_row("Estimated cost", f"${total_cost:.4f} (${total_cost / len(records):.4f} per call)")
+        elapsed = sum(latencies)
+        if elapsed:
+            table.add_row("Throughput", f"{len(records) / elapsed * 60:.1f} calls per minute of AI time")
+        return table
+
+    def prompt_cache_summary(self) -> str:
+        stats = self.prompt_cache_stats
+        if not stats["calls"]:
+            return ""
+        misses = stats["calls"] - stats["hits"]
+        hit_avg = stats["hit_seconds"] / stats["hits"] if stats["hits"] else 0.0
+        miss_avg = stats["miss_seconds"] / misses if misses else 0.0
+        return (
+            f"Prompt cache: {stats['hits']}/{stats['calls']} calls hit the cache "
+            f"(avg {hit_avg:.2f}s hit vs {miss_avg:.2f}s miss), "
+            f"{stats['cache_read_input_tokens']} tokens read from cache, "
+            f"{stats['cache_creation_input_tokens']} written to cache, "
+            f"{stats['input_tokens']} uncached input tokens."
+        )
+
     def parse_ai_response(
             self, response: str
     ) -> Tuple[str, List[str], List[Tuple[str, str]]]:
@@ -606,125 +1372,36 @@ class FrenchVocabBuilder:
         Returns:
             str: Formatted LaTeX entry for the word.
         """
-        # Capitalize the word
-        capitalized_word = word.capitalize()
-
-        def_items = "".join([f"    \\item {d}\n" for d in definitions])
-        example_items = "".join(
-            [f"    \\item {e[0]} \\\\ ({e[1]})\n" for e in examples]
-        )
-
-        latex_entry = f"""\\entry{{{capitalized_word}}}{{{word_type}}}
-      {{
-    {def_items.rstrip()}
-      }}
-      {{
-    {example_items.rstrip()}
-      }}"""
-
-        # Remove all square brackets using regex
-        latex_entry = re.sub(r"\[|\]", "", latex_entry)
-
-        return latex_entry
+        return render_latex_entry(word, word_type, definitions, examples)
 
-    def insert_entry_alphabetically(self, new_entry: str, new_word: str) -> None:
-        try:
-            with open(self.latex_file, "r", encoding="utf-8") as file:
-                content = file.read()
-
-            # Find the position to insert the new entry
-            insert_position = content.rfind("\\entry")
-            insert_position = content.find("\\end{itemize}", insert_position)
-
-            # Insert the new entry
-            updated_content = (
-                    content[:insert_position]
-                    + new_entry
-                    + "\n\n"
-                    + content[insert_position:]
-            )
-
-            with open(self.latex_file, "w", encoding="utf-8") as file:
-                file.write(updated_content)
-
-            console.print(f"[bold green]Added/Updated entry for '{new_word}' in {self.latex_file}[/bold green]")
-
-            # Update the normalized entries dictionary
-            normalized_new_word = self.normalize_word(new_word)
-            self.normalized_entries[normalized_new_word] = new_word.capitalize()
-
-        except FileNotFoundError:
-            console.print(f"[bold red]Error: File not found - {self.latex_file}[/bold red]")
-        except IOError as e:
-            console.print(f"[bold red]Error reading from or writing to file: {e}[/bold red]")
-
-    def alphabetize_entries(self) -> None:
-        """Alphabetizes the entries in the LaTeX file.
-
-        This method reads the LaTeX file, identifies the section containing 
-        vocabulary entries, and sorts them alphabetically based on the 
-        normalized form of the words. The sorted entries are then written 
-        back to the LaTeX file.
+    def save_entry(
+            self,
+            word: str,
+            word_type: str,
+            definitions: List[str],
+            examples: List[Tuple[str, str]]
+    ) -> None:
+        """Adds an entry to the vocabulary store and rebuilds the LaTeX file.
 
-        Raises:
-            FileNotFoundError: If the LaTeX file does not exist.
-            IOError: If there is an error reading from or writing to the file.
+        The in-memory word_entries and normalized_entries are updated as well,
+        so the new word is immediately visible to duplicate checks and exports.
         """
-        try:
-            with open(self.latex_file, "r", encoding="utf-8") as file:
-                content = file.read()
-
-            # Find the start and end of the entries section
-            entries_start = content.find("\\begin{itemize}[leftmargin=*]")
-            entries_end = content.rfind("\\end{itemize}")
+        normalized_new_word = self.normalize_word(word)
+        self.store.add(word.capitalize(), normalized_new_word, word_type, definitions, examples)
+        self.index_entry(word.lower(), VocabEntry(word.capitalize(), word_type, definitions, examples))
 
-            if entries_start == -1 or entries_end == -1:
-                console.print("[bold red]Error: Could not find the entries section.[/bold red]")
-                return
-
-            # Split the content into header, entries, and footer
-            header = content[:entries_start]
-            entries_section = content[entries_start:entries_end]
-            footer = content[entries_end:]
-
-            # Extract all \entry blocks
-            entry_pattern = r"(\\entry\{.*?\}.*?(?=\\entry|\Z))"
-            entries = re.findall(entry_pattern, entries_section, re.DOTALL)
-
-            if not entries:
-                console.print("[bold yellow]No entries found to alphabetize.[/bold yellow]")
-                return
-
-            # Sort entries based on the normalized word (first argument of \entry)
-            sorted_entries = sorted(
-                entries,
-                key=lambda x: self.normalize_word(re.search(r"\\entry\{(.*?)\}", x).group(1))
-            )
-
-            # Reconstruct the entries section
-            sorted_entries_section = "\\begin{itemize}[leftmargin=*]\n" + "".join(sorted_entries)
-
-            # Reconstruct the file content
-            sorted_content = header + sorted_entries_section + footer
-
-            # Safeguard: Check if we're not accidentally removing a large portion of the content
-            if len(sorted_content) < len(content) * 0.9:  # If we've lost more than 10% of content
-                console.print(
-                    "[bold red]Warning: Significant content loss detected. Aborting alphabetization.[/bold red]")
-                return
-
-            # Write the sorted content back to the file
-            with open(self.latex_file, "w", encoding="utf-8") as file:
-                file.write(sorted_content)
-
-            console.print("[bold green]Entries alphabetized successfully.[/bold green]")
+        # Update the normalized entries dictionary
+        self.normalized_entries[normalized_new_word] = word.capitalize()
+        self.index_spelling(normalized_new_word)
 
-        except FileNotFoundError:
-            console.print(f"[bold red]Error: File not found - {self.latex_file}[/bold red]")
-        except IOError as e:
-            console.print(f"[bold red]Error reading from or writing to file: {e}[/bold red]")
+        console.print(f"[bold green]Added/Updated entry for '{word.capitalize()}' in {self.store_file}[/bold green]")
+        self.build_latex()
 
     def exit_screen(self):
+        if self.pdf_builder and self.pdf_builder.available:
+            console.print("[dim]Finishing the background PDF build...[/dim]")
+            self.pdf_builder.stop()
+            console.print(self.pdf_builder.status_line())
         console.print(
             Panel.fit(
                 "[bold blue]Thank you for using the French Vocabulary LaTeX Builder![/bold blue]\n\n"
@@ -733,6 +1410,22 @@ class FrenchVocabBuilder:
                 border_style="bold green",
             )
         )
+        usage_table = self.usage_report()
+        if usage_table:
+            console.print(usage_table)
+        cache_summary = self.prompt_cache_summary()
+        if cache_summary:
+            console.print(f"[dim]{cache_summary}[/dim]")
+        if self.transport:
+            ttfb_summary = self.transport.ttfb_summary()
+            if ttfb_summary:
+                console.print(f"[dim]{ttfb_summary}[/dim]")
+            self.transport.close()
+        if self.write_lock.contended:
+            console.print(
+                f"[dim]Waited {self.write_lock.total_wait:.2f}s in total for other writers "
+                f"({self.write_lock.contended} times).[/dim]"
+            )
 
     def remove_accents(self, input_str):
         nfkd_form = unicodedata.normalize("NFKD", input_str)
@@ -741,15 +1434,20 @@ class FrenchVocabBuilder:
     def run(self):
         self.welcome_screen()
         while True:
+            self.refresh_entries()
             self.entry_count = self.count_entries()
             choice = self.show_menu()
             if choice == "1":
                 self.handle_new_word_entry()
             elif choice == "2":
-                self.handle_anki_export()
+                self.handle_word_queue()
             elif choice == "3":
-                self.reconcile_menu_option()  # New option
+                self.handle_anki_export()
             elif choice == "4":
+                self.reconcile_menu_option()
+            elif choice == "5":
+                self.show_statistics()
+            elif choice == "6":
                 self.exit_screen()
                 break
             self.console.input("\nPress Enter to continue...")
@@ -757,25 +1455,55 @@ class FrenchVocabBuilder:
     def handle_new_word_entry(self):
         word = self.get_word_input()
         if word:
-            existing_word = self.check_duplicate(word)
-            if existing_word:
-                if not self.handle_duplicate(word, existing_word):
-                    return  # User chose to skip or view existing entry
-            
+            if not self.confirm_new_word(word):
+                return  # User chose to skip or view existing entry
+
             ai_response = self.query_ai(word)
-            if ai_response:
-                word = self.check_spelling(word, ai_response)
-                if word is None:  # User chose to abandon the edit
-                    return
-                self.process_ai_response(word, ai_response)
-                self.add_word_to_entries(word, ai_response)
-                self.alphabetize_entries()
-            else:
-                self.console.print(f"[bold red]Failed to get information for '{word}'. Skipping this entry.[/bold red]")
+            self.complete_word_entry(word, ai_response)
+
+    def complete_word_entry(self, word: str, ai_response: str):
+        if ai_response:
+            word = self.check_spelling(word, ai_response)
+            if word is None:  # User chose to abandon the edit
+                return
+            self.process_ai_response(word, ai_response)
+        else:
+            self.console.print(f"[bold red]Failed to get information for '{word}'. Skipping this entry.[/bold red]")
+
+    def handle_word_queue(self):
+        """Adds several words in a row, prefetching AI responses for the next ones.
+
+        While the user confirms spelling and reviews the current word, the
+        responses for up to ``queue_lookahead`` following words are fetched in
+        the background. Abandoning the queue cancels all pending fetches.
+        """
+        words = self.get_word_queue_input()
+        if not words:
+            return
+
+        queue = WordPrefetchQueue(self.fetch_ai_response, words, lookahead=self.queue_lookahead)
+        try:
+            for position, (word, ai_response, error) in enumerate(queue, start=1):
+                self.console.print(Panel(f"Word {position} of {len(words)}: [bold]{word}[/bold]", border_style="cyan"))
+                if error:
+                    self.console.print(f"[bold red]Error querying AI: {error}[/bold red]")
+                self.complete_word_entry(word, ai_response)
+
+                remaining = queue.remaining()
+                if remaining:
+                    choice = self.console.input(
+                        f"\nPress Enter for '{remaining[0]}' ({len(remaining)} left), or 'q' to abandon the queue: "
+                    )
+                    if choice.strip().lower() == 'q':
+                        self.console.print(f"[yellow]Abandoned {len(remaining)} queued word(s): {', '.join(remaining)}[/yellow]")
+                        break
+        finally:
+            queue.cancel()
 
     def process_ai_response(self, word, ai_response):
         word_type, definitions, examples = self.parse_ai_response(ai_response)
-        self.display_parsed_info(word, word_type, definitions, examples)
+        word_type = ", ".join(word_type) if isinstance(word_type, list) else word_type
+        self.display_parsed_info(word, [word_type], definitions, examples)
 
         word = self.check_spelling(word, ai_response)
         if word is None:  # User chose to abandon the edit
@@ -789,8 +1517,7 @@ class FrenchVocabBuilder:
             return None
 
         self.display_latex_entry(latex_entry)
-        self.insert_entry_alphabetically(latex_entry, word.capitalize())
-        self.add_word_to_entries(word, ai_response)
+        self.save_entry(word, word_type, definitions, examples)
 
         return word
 
@@ -798,14 +1525,12 @@ class FrenchVocabBuilder:
         # Check if the entry is not empty and contains the expected LaTeX structure
         return bool(latex_entry.strip()) and "\\entry{" in latex_entry and "}{" in latex_entry
 
-    def check_spelling(self, word, ai_response):
-
-        spelling_check_match = re.search(r'Spelling Check:\s*(.*)', ai_response)
-        spelling_check = spelling_check_match.group(1) if spelling_check_match else None
-
+    def extract_corrected_spelling(self, ai_response: str) -> Optional[str]:
         corrected_spelling_match = re.search(r'Correctly Spelt Word:\s*(.*)', ai_response)
-        corrected_spelling = corrected_spelling_match.group(1) if corrected_spelling_match else None
+        return corrected_spelling_match.group(1).strip() if corrected_spelling_match else None
 
+    def check_spelling(self, word, ai_response):
+        corrected_spelling = self.extract_corrected_spelling(ai_response)
 
         if corrected_spelling and corrected_spelling.lower().strip() != word.lower().strip():
             self.console.print(f"Did you mean '{corrected_spelling}' instead of '{word}'?")
@@ -821,18 +1546,126 @@ class FrenchVocabBuilder:
                 return None
         return word
 
-    def add_word_to_entries(self, word, ai_response):
-        word_type, definitions, examples = self.parse_ai_response(ai_response)
-        self.word_entries[word.lower()] = {
-            "word": word.capitalize(),
-            "type": word_type,
-            "definitions": "; ".join(definitions),
-            "examples": "; ".join([f"{f} ({e})" for f, e in examples]),
+    def export_text(self, path: str, fmt: Optional[str] = None, compress: Optional[bool] = None,
+                    resume: bool = False) -> Optional[Dict]:
+        """Streams every entry to a TSV, CSV or JSONL file (see vocab_export.stream_export).
+
+        Unlike export_to_anki, this always writes the whole vocabulary and does
+        not change which words count as exported to Anki.
+        """
+        from vocab_export import stream_export
+        try:
+            result = stream_export(self.store, path, fmt=fmt, compress=compress, resume=resume)
+        except (ValueError, IOError) as e:
+            console.print(f"[bold red]Export failed: {e}[/bold red]")
+            return None
+        console.print(
+            f"[bold green]{'Resumed and finished' if result['resumed'] else 'Wrote'} '{result['path']}': "
+            f"{result['entries']} entries ({result['bytes']} bytes) in {result['seconds']:.2f}s[/bold green]"
+        )
+        return result
+
+    def statistics(self) -> Dict:
+        """Summarises the vocabulary from the store's running totals, without reading any entry."""
+        stats = self.store.stats()
+        total = int(stats.get("entries", {}).get("", 0))
+        by_type: Dict[str, int] = {}
+        for label, count in stats.get("entries_by_type", {}).items():
+            name = classify_word_type(label).name.replace("_", " ").title()
+            by_type[name] = by_type.get(name, 0) + int(count)
+        exported = int(stats.get("exported_entries", {}).get("", 0))
+        last_export = self.store.get_meta("last_anki_export")
+        return {
+            "entries": total,
+            "by_type": dict(sorted(by_type.items(), key=lambda item: -item[1])),
+            "by_month": {month: int(count) for month, count in sorted(stats.get("entries_by_month", {}).items())},
+            "exported_to_anki": exported,
+            "anki_exports": int(stats.get("anki_exports", {}).get("", 0)),
+            "last_anki_export": float(last_export) if last_export else None,
+            "text_exports": {fmt: int(count) for fmt, count in stats.get("text_exports", {}).items()},
+            "api_calls": int(stats.get("api_calls", {}).get("", 0)),
+            "api_cost": stats.get("api_cost", {}).get("", 0.0),
+            "api_cost_by_month": dict(sorted(stats.get("api_cost_by_month", {}).items())),
+            "api_tokens": {field: int(count) for field, count in stats.get("api_tokens", {}).items()},
         }
 
+    def show_statistics(self, months: int = 12):
+        stats = self.statistics()
+        total = stats["entries"]
+
+        types = Table(title=f"Vocabulary: {total} words")
+        types.add_column("Word type", style="cyan")
+        types.add_column("Words", justify="right", style="magenta")
+        types.add_column("Share", justify="right")
+        for name, count in stats["by_type"].items():
+            types.add_row(name, str(count), f"{count / total:.0%}" if total else "-")
+
+        growth = Table(title="Growth")
+        growth.add_column("Month", style="cyan")
+        growth.add_column("Added", justify="right", style="magenta")
+        growth.add_column("Total", justify="right")
+        growth.add_column("API spend", justify="right", style="yellow")
+        running = 0
+        rows = []
+        for month in sorted(set(stats["by_month"]) | set(stats["api_cost_by_month"])):
+            running += stats["by_month"].get(month, 0)
+            rows.append((month, str(stats["by_month"].get(month, 0)), str(running),
+                         f"${stats['api_cost_by_month'].get(month, 0.0):.2f}"))
+        for row in rows[-months:]:
+            growth.add_row(*row)
+
+        exported = stats["exported_to_anki"]
+        last_export = (time.strftime("%Y-%m-%d %H:%M", time.localtime(stats["last_anki_export"]))
+                       if stats["last_anki_export"] else "never")
+        text_exports = ", ".join(f"{count} {fmt.upper()}" for fmt, count in sorted(stats["text_exports"].items()))
+        tokens = stats["api_tokens"]
+        calls = stats["api_calls"]
+        coverage = (f"{exported} of {total} words exported ({exported / total:.0%}), "
+                    f"{max(0, total - exported)} not yet exported") if total else "no words yet"
+        exports = f"{stats['anki_exports']} Anki (last: {last_export})"
+        if text_exports:
+            exports += f", {text_exports} text exports"
+        spend = f"${stats['api_cost']:.2f} over {calls} calls"
+        if calls:
+            spend += f" (${stats['api_cost'] / calls:.4f} per call)"
+        summary = "\n".join([
+            f"[bold]Anki coverage:[/bold] {coverage}",
+            f"[bold]Exports:[/bold] {exports}",
+            f"[bold]API spend:[/bold] {spend}",
+            f"[bold]Tokens:[/bold] {tokens.get('input_tokens', 0)} input, {tokens.get('output_tokens', 0)} output, "
+            f"{tokens.get('cache_read_input_tokens', 0)} read from cache, "
+            f"{tokens.get('cache_creation_input_tokens', 0)} written to cache",
+        ])
+
+        console.print(types)
+        if rows:
+            console.print(growth)
+        console.print(Panel(summary, title="Exports and API", border_style="green", expand=False))
+
     def handle_anki_export(self):
-        deck_name = Prompt.ask("Enter a name for your Anki deck", default="French Vocabulary")
-        self.export_to_anki(deck_name)
+        fmt = Prompt.ask("Export format", choices=["apkg", "tsv", "csv", "jsonl"], default="apkg")
+        if fmt != "apkg":
+            compress = Confirm.ask("Compress with gzip?", default=False)
+            path = Prompt.ask("Output file", default=f"FrenchVocab.{fmt}{'.gz' if compress else ''}")
+            resume = os.path.exists(path + ".cursor") and Confirm.ask(
+                f"An earlier export to '{path}' was interrupted. Resume it?", default=True
+            )
+            self.export_text(path, fmt=fmt, compress=compress, resume=resume)
+            return
+        while True:
+            deck_name = Prompt.ask("Enter a name for your Anki deck", default="French Vocabulary")
+            error = self.validate_deck_name(deck_name)
+            if not error:
+                break
+            self.console.print(f"[bold red]Error: {error}[/bold red]")
+        partition = Prompt.ask("Split into separate decks by", choices=["none", "type", "letter"], default="none")
+        types_answer = Prompt.ask(
+            "Only export these word types (comma-separated, e.g. verb, noun, expression; blank for all)",
+            default="",
+        )
+        word_types = self.parse_word_types(types_answer.split(","))
+        self.export_to_anki(deck_name, word_types=word_types or None,
+                            partition_by=None if partition == "none" else partition)
     
     def display_parsed_info(
             self,
@@ -912,18 +1745,40 @@ class FrenchVocabBuilder:
 
 def main() -> None:
     start_time = time.time()
-    
-    if len(sys.argv) > 1:
-        latex_file = sys.argv[1]
-    else:
-        latex_file = None
+
+    parser = argparse.ArgumentParser(description="Build a LaTeX French vocabulary list with AI-generated entries.")
+    parser.add_argument("latex_file", nargs="?", default=None,
+                        help=f"LaTeX file to maintain (default: {FrenchVocabBuilder.DEFAULT_FILENAME} in the current directory)")
+    parser.add_argument("--serve", action="store_true", help="run the local HTTP/JSON service instead of the menu")
+    parser.add_argument("--host", default="127.0.0.1", help="address for --serve (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="port for --serve (default: 8765)")
+    parser.add_argument("--lint", action="store_true", help="validate every entry and exit (no API key needed)")
+    parser.add_argument("--fix", action="store_true", help="with --lint, fix what can be fixed in a single rewrite")
+    parser.add_argument("--report", help="with --lint, also write the JSON report to this file")
+    parser.add_argument("--export", metavar="OUTPUT",
+                        help="export all entries to a .tsv, .csv or .jsonl file (optionally .gz) and exit")
+    parser.add_argument("--resume", action="store_true", help="with --export, continue an interrupted export")
+    args = parser.parse_args()
+
+    if args.lint:
+        from vocab_lint import run_lint
+        latex_file = args.latex_file or os.path.join(os.getcwd(), FrenchVocabBuilder.DEFAULT_FILENAME)
+        sys.exit(run_lint(latex_file, fix=args.fix, report_file=args.report))
+    if args.export:
+        from vocab_export import run_export
+        latex_file = args.latex_file or os.path.join(os.getcwd(), FrenchVocabBuilder.DEFAULT_FILENAME)
+        sys.exit(run_export(latex_file, args.export, resume=args.resume))
 
     init_start = time.time()
-    app = FrenchVocabBuilder("/Users/sihao/Documents/LaTeX Files/FrenchVocab.tex")
+    app = FrenchVocabBuilder(args.latex_file)
     init_end = time.time()
     
     run_start = time.time()
-    app.run()
+    if args.serve:
+        from vocab_service import VocabService
+        VocabService(app, host=args.host, port=args.port).serve_forever()
+    else:
+        app.run()
     run_end = time.time()
 
     print(f"Total startup time: {init_end - start_time:.2f} seconds")
@@ -931,4 +1786,4 @@ def main() -> None:
     print(f"Run time: {run_end - run_start:.2f} seconds")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,81 @@
+"""Memory footprint of the in-memory entry representation.
+
+Compares the previous layout (one dict per word with list values and a
+separately allocated type string per entry, as produced by parsing) with the
+slotted VocabEntry record.
+
+Usage:
+    python benchmarks/entry_memory.py [--entries 100000]
+"""
+
+import argparse
+import gc
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from FrenchVocab import VocabEntry  # noqa: E402
+
+WORD_TYPES = ["noun", "verb", "adjective", "adverb", "expression", "pronominal verb",
+              "noun (feminine)", "noun (masculine)", "past participle"]
+
+
+def source_rows(count: int, seed: int = 0):
+    """Yields (word, type, definitions, examples) built from fresh strings, like a parser would."""
+    rng = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyzéèàç"
+    for i in range(count):
+        word = "".join(rng.choice(letters) for _ in range(rng.randint(4, 12))) + str(i)
+        # Slicing a longer string gives a new object each time, like a regex group.
+        word_type = ("Word Type: " + rng.choice(WORD_TYPES))[11:]
+        definitions = [f"Definition {j} of {word}, with some nuance" for j in range(3)]
+        examples = [(f"Phrase d'exemple {j} avec le mot {word}.", f"Example sentence {j} using {word}.")
+                    for j in range(3)]
+        yield word, word_type, definitions, examples
+
+
+def measure(build) -> int:
+    gc.collect()
+    tracemalloc.start()
+    container = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del container
+    return current
+
+
+def dict_layout(count: int):
+    return {
+        word: {"word": word, "type": word_type, "definitions": definitions, "examples": examples}
+        for word, word_type, definitions, examples in source_rows(count)
+    }
+
+
+def slotted_layout(count: int):
+    return {
+        word: VocabEntry(word, word_type, definitions, examples)
+        for word, word_type, definitions, examples in source_rows(count)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=100_000)
+    args = parser.parse_args()
+
+    dict_bytes = measure(lambda: dict_layout(args.entries))
+    slotted_bytes = measure(lambda: slotted_layout(args.entries))
+
+    print(f"Entries:            {args.entries}")
+    print(f"dict layout:        {dict_bytes / 2**20:8.1f} MiB ({dict_bytes / args.entries:.0f} B/entry)")
+    print(f"VocabEntry layout:  {slotted_bytes / 2**20:8.1f} MiB ({slotted_bytes / args.entries:.0f} B/entry)")
+    print(f"Saving:             {(dict_bytes - slotted_bytes) / 2**20:8.1f} MiB "
+          f"({(1 - slotted_bytes / dict_bytes) * 100:.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""Local stand-in for the Anthropic Messages API, for load tests without API calls.
+
+Answers POST /v1/messages with a reply in the format AI_SYSTEM_PROMPT asks
+for, after a configurable latency. A fraction of requests can be failed with
+a 529 overloaded error or rejected with a 429 rate limit error, to exercise
+the client's retries. Point the app at it with ANTHROPIC_BASE_URL.
+
+Usage:
+    python benchmarks/fake_anthropic.py [--port 8766] [--latency 0.5] [--jitter 0.2]
+                                        [--error-rate 0.01] [--rate-limit-rate 0.05]
+    ANTHROPIC_BASE_URL=http://127.0.0.1:8766 python FrenchVocab.py
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+
+WORD_TYPES = ["noun (masculine)", "noun (feminine)", "verb", "adjective", "adverb", "expression", "pronominal verb"]
+
+
+def fake_reply(word: str, rng: random.Random) -> str:
+    """Builds a reply in the format requested by AI_SYSTEM_PROMPT."""
+    word_type = rng.choice(WORD_TYPES)
+    definitions = "\n".join(
+        f"{letter}. {sense} meaning of {word}, with some nuance"
+        for letter, sense in zip("abc", ["First", "Second", "Third"][:rng.randint(2, 3)])
+    )
+    examples = "\n".join(
+        f"{n}. Voici une phrase d'exemple numéro {n} avec « {word} ».\nHere is example sentence number {n} with '{word}'."
+        for n in range(1, rng.randint(2, 3) + 1)
+    )
+    return (
+        f"Spelling Check: The spelling is correct.\n"
+        f"Correctly Spelt Word: {word}\n"
+        f"Word Type: {word_type}\n"
+        f"Definitions:\n{definitions}\n"
+        f"Examples:\n{examples}"
+    )
+
+
+class FakeAnthropicServer:
+    """Threaded HTTP server imitating POST /v1/messages.
+
+    Args:
+        latency: Mean seconds before each response.
+        jitter: Latency is drawn uniformly from latency ± jitter.
+        error_rate: Fraction of requests answered with 529 overloaded_error.
+        rate_limit_rate: Fraction of requests answered with 429 rate_limit_error.
+        retry_after: Seconds suggested to the client in 429 responses.
+        seed: Seed for the random choices, so runs are reproducible.
+        api_key: If set, requests with any other x-api-key get a 401
+            authentication_error.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.5, jitter: float = 0.2,
+                 error_rate: float = 0.0, rate_limit_rate: float = 0.0, retry_after: float = 0.1, seed: int = 0,
+                 api_key: Optional[str] = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.api_key = api_key
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counts = {"requests": 0, "ok": 0, "rate_limited": 0, "errors": 0}
+        self.cache_written = False
+        self.server = ThreadingHTTPServer((host, port), self._handler_class())
+        self.server.daemon_threads = True
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> threading.Thread:
+        thread = threading.Thread(target=self.server.serve_forever, name="fake-anthropic", daemon=True)
+        thread.start()
+        return thread
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def respond(self, body: Dict) -> Tuple[int, Dict, Dict]:
+        """Returns (status, headers, payload) for one messages request."""
+        with self.lock:
+            self.counts["requests"] += 1
+            request_number = self.counts["requests"]
+            roll = self.rng.random()
+            delay = max(0.0, self.rng.uniform(self.latency - self.jitter, self.latency + self.jitter))
+            reply_rng = random.Random(self.rng.random())
+            cache_hit = self.cache_written
+            self.cache_written = True
+
+        if roll < self.rate_limit_rate:
+            with self.lock:
+                self.counts["rate_limited"] += 1
+            # Rate limit rejections are immediate, as with the real API.
+            return 429, {"retry-after-ms": str(int(self.retry_after * 1000))}, {
+                "type": "error", "error": {"type": "rate_limit_error", "message": "Fake rate limit"}}
+
+        time.sleep(delay)
+        if roll < self.rate_limit_rate + self.error_rate:
+            with self.lock:
+                self.counts["errors"] += 1
+            return 529, {}, {"type": "error", "error": {"type": "overloaded_error", "message": "Fake overload"}}
+
+        prompt = "".join(
+            block.get("text", "") if isinstance(block, dict) else str(block)
+            for message in body.get("messages", [])
+            for block in (message["content"] if isinstance(message["content"], list) else [message["content"]])
+        )
+        match = re.search(r'"(.+?)"', prompt)
+        word = match.group(1) if match else prompt.strip()[:40]
+        text = fake_reply(word, reply_rng)
+        system = "".join(block.get("text", "") for block in body.get("system", []) if isinstance(block, dict))
+        system_tokens = len(system) // 4
+        with self.lock:
+            self.counts["ok"] += 1
+        return 200, {}, {
+            "id": f"msg_fake_{request_number}",
+            "type": "message",
+            "role": "assistant",
+            "model": body.get("model", "fake"),
+            "content": [{"type": "text", "text": text}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": {
+                "input_tokens": len(prompt) // 4,
+                "output_tokens": len(text) // 4,
+                "cache_creation_input_tokens": 0 if cache_hit else system_tokens,
+                "cache_read_input_tokens": system_tokens if cache_hit else 0,
+            },
+        }
+
+    def _handler_class(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+                if fake.api_key and self.headers.get("x-api-key") != fake.api_key:
+                    status, headers, payload = 401, {}, {
+                        "type": "error", "error": {"type": "authentication_error", "message": "invalid x-api-key"}}
+                elif self.path.rstrip("/").endswith("/v1/messages"):
+                    status, headers, payload = fake.respond(body)
+                else:
+                    status, headers, payload = 404, {}, {
+                        "type": "error", "error": {"type": "not_found_error", "message": self.path}}
+                data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--jitter", type=float, default=0.2)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--api-key", help="reject requests using any other key with a 401")
+    args = parser.parse_args()
+
+    fake = FakeAnthropicServer(args.host, args.port, latency=args.latency, jitter=args.jitter,
+                               error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate, seed=args.seed,
+                               api_key=args.api_key)
+    print(f"Fake Anthropic API on {fake.base_url} (set ANTHROPIC_BASE_URL to use it)")
+    try:
+        fake.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(json.dumps(fake.counts))
+        fake.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
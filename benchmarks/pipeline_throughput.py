@@ -0,0 +1,254 @@
+"""End-to-end throughput of the add-word pipeline against a local fake API.
+
+Each word goes through fetch_ai_response, parse_ai_response and save_entry
+(store insert and LaTeX rebuild), with the Anthropic client pointed at
+benchmarks/fake_anthropic.py. Three modes are measured, each on a fresh
+vocabulary in a temporary directory:
+
+    interactive  one word at a time, as with "Add a new word"
+    batch        words through WordPrefetchQueue, as with "Add several words"
+    concurrent   --clients threads posting to /add of a VocabService
+                 (with "force", since the other modes skip duplicate checks too)
+
+Reported per mode: words per second, p50/p99 latency per word (from the
+word's turn to its entry being saved; the request round trip in concurrent
+mode), how often the .tex file was rewritten, and the write amplification:
+bytes written to the .tex file per byte of entries added.
+
+Usage:
+    python benchmarks/pipeline_throughput.py [--words 50] [--existing 1000] [--clients 4]
+        [--modes interactive,batch,concurrent] [--latency 0.2] [--jitter 0.1]
+        [--error-rate 0.0] [--rate-limit-rate 0.0]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import FrenchVocab  # noqa: E402
+from FrenchVocab import FrenchVocabBuilder, WordPrefetchQueue, percentile  # noqa: E402
+from fake_anthropic import FakeAnthropicServer  # noqa: E402
+
+MODES = ("interactive", "batch", "concurrent")
+
+
+def make_words(count: int, seed: int = 1) -> List[str]:
+    """Unique, pronounceable made-up words (letters only, so input validation accepts them)."""
+    rng = random.Random(seed)
+    syllables = ["ba", "che", "dé", "fou", "gra", "li", "mon", "nu", "pé", "quor", "ré", "sil", "tan", "vé"]
+    words = set()
+    while len(words) < count:
+        words.add("".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+class WriteCounter:
+    """Counts rewrites of the .tex file by wrapping the builder's build_latex."""
+
+    def __init__(self, builder: FrenchVocabBuilder):
+        self.latex_file = builder.latex_file
+        self.rewrites = 0
+        self.bytes_written = 0
+        build_latex = builder.build_latex
+
+        def counted_build_latex():
+            before = self._signature()
+            build_latex()
+            after = self._signature()
+            if after and after != before:
+                self.rewrites += 1
+                self.bytes_written += after[2]
+
+        builder.build_latex = counted_build_latex
+
+    def _signature(self):
+        try:
+            stat = os.stat(self.latex_file)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def add_word(builder: FrenchVocabBuilder, word: str, ai_response: str) -> bool:
+    """The non-interactive part of complete_word_entry: parse and save."""
+    if not ai_response:
+        return False
+    word = builder.extract_corrected_spelling(ai_response) or word
+    word_type, definitions, examples = builder.parse_ai_response(ai_response)
+    if not definitions or not examples:
+        return False
+    builder.save_entry(word, ", ".join(word_type) if isinstance(word_type, list) else word_type,
+                       definitions, examples)
+    return True
+
+
+def run_interactive(builder: FrenchVocabBuilder, words: List[str], clients: int) -> List[Optional[float]]:
+    latencies = []
+    for word in words:
+        start = time.perf_counter()
+        try:
+            ok = add_word(builder, word, builder.fetch_ai_response(word))
+        except Exception:
+            ok = False
+        latencies.append(time.perf_counter() - start if ok else None)
+    return latencies
+
+
+def run_batch(builder: FrenchVocabBuilder, words: List[str], clients: int) -> List[Optional[float]]:
+    latencies = []
+    queue = WordPrefetchQueue(builder.fetch_ai_response, words, lookahead=builder.queue_lookahead)
+    try:
+        start = time.perf_counter()
+        for word, ai_response, error in queue:
+            ok = error is None and add_word(builder, word, ai_response)
+            latencies.append(time.perf_counter() - start if ok else None)
+            start = time.perf_counter()
+    finally:
+        queue.cancel()
+    return latencies
+
+
+def run_concurrent(builder: FrenchVocabBuilder, words: List[str], clients: int) -> List[Optional[float]]:
+    from vocab_service import VocabService, console as service_console
+    service_console.quiet = True
+    service = VocabService(builder, port=0)
+    service.start()
+    host, port = service.address
+
+    def post(word: str) -> Optional[float]:
+        request = urllib.request.Request(
+            f"http://{host}:{port}/add", data=json.dumps({"word": word, "force": True}).encode("utf-8"),
+            headers={"Content-Type": "application/json"}, method="POST",
+        )
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=120) as response:
+                response.read()
+        except urllib.error.HTTPError:
+            return None
+        return time.perf_counter() - start
+
+    try:
+        with ThreadPoolExecutor(max_workers=clients) as executor:
+            return list(executor.map(post, words))
+    finally:
+        service.close()
+
+
+RUNNERS = {"interactive": run_interactive, "batch": run_batch, "concurrent": run_concurrent}
+
+
+def seed_vocabulary(builder: FrenchVocabBuilder, count: int):
+    """Adds count existing entries in one go, so rebuilds work on a realistically sized file."""
+    rows = []
+    for word in make_words(count, seed=2):
+        word = "ex" + word
+        rows.append((word.capitalize(), builder.normalize_word(word), "noun",
+                     [f"Existing meaning of {word}"], [(f"Un exemple avec {word}.", f"An example with {word}.")]))
+    builder.store.add_many(rows)
+    builder.build_latex()
+    builder.refresh_entries()
+
+
+def measure_mode(mode: str, args) -> Dict:
+    fake = FakeAnthropicServer(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                               rate_limit_rate=args.rate_limit_rate, seed=args.seed)
+    fake.start()
+    previous_cwd = os.getcwd()
+    previous_env = {key: os.environ.get(key) for key in ("ANTHROPIC_BASE_URL", "ANTHROPIC_API_KEY")}
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        os.environ["ANTHROPIC_BASE_URL"] = fake.base_url
+        os.environ["ANTHROPIC_API_KEY"] = "sk-ant-fake-" + "0" * 32
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                builder = FrenchVocabBuilder(os.path.join(directory, "FrenchVocab.tex"))
+            builder.console.quiet = True
+            builder.get_anthropic_client()
+            if args.existing:
+                seed_vocabulary(builder, args.existing)
+            size_before = os.path.getsize(builder.latex_file)
+            counter = WriteCounter(builder)
+
+            words = make_words(args.words, seed=args.seed + 1)
+            start = time.perf_counter()
+            latencies = RUNNERS[mode](builder, words, args.clients)
+            elapsed = time.perf_counter() - start
+
+            added_bytes = os.path.getsize(builder.latex_file) - size_before
+            if builder.pdf_builder:
+                builder.pdf_builder.stop()
+        finally:
+            os.chdir(previous_cwd)
+            for key, value in previous_env.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+            fake.close()
+
+    succeeded = [latency for latency in latencies if latency is not None]
+    return {
+        "mode": mode,
+        "words": len(words),
+        "failed": len(latencies) - len(succeeded),
+        "seconds": elapsed,
+        "words_per_second": len(succeeded) / elapsed if elapsed else 0.0,
+        "p50": percentile(succeeded, 50),
+        "p99": percentile(succeeded, 99),
+        "rewrites": counter.rewrites,
+        "amplification": counter.bytes_written / added_bytes if added_bytes > 0 else 0.0,
+        "api": dict(fake.counts),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--words", type=int, default=50)
+    parser.add_argument("--existing", type=int, default=1000, help="entries in the vocabulary before the run")
+    parser.add_argument("--clients", type=int, default=4, help="concurrent clients in concurrent mode")
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--latency", type=float, default=0.2, help="mean fake API latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.1)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of 529 overloaded responses")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction of 429 responses")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    unknown = set(modes) - set(MODES)
+    if unknown:
+        parser.error(f"unknown mode(s): {', '.join(sorted(unknown))}")
+
+    # The app prints a line for every saved entry; keep the benchmark output readable.
+    FrenchVocab.console.quiet = True
+    results = [measure_mode(mode, args) for mode in modes]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{args.words} words, {args.existing} existing entries, fake API latency "
+          f"{args.latency:.2f}±{args.jitter:.2f}s, {args.error_rate:.0%} errors, {args.rate_limit_rate:.0%} rate limited")
+    print(f"{'mode':<12} {'words/s':>8} {'p50 (s)':>8} {'p99 (s)':>8} {'failed':>6} {'rewrites':>8} "
+          f"{'write amp.':>10} {'API calls':>9} {'429s':>5}")
+    for r in results:
+        print(f"{r['mode']:<12} {r['words_per_second']:>8.2f} {r['p50']:>8.3f} {r['p99']:>8.3f} {r['failed']:>6} "
+              f"{r['rewrites']:>8} {r['amplification']:>9.1f}x {r['api']['requests']:>9} {r['api']['rate_limited']:>5}")
+
+
+if __name__ == "__main__":
+    main()
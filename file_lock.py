@@ -0,0 +1,92 @@
+# file_lock.py
+#
+# Advisory cross-process lock on a lock file, used to serialize rewrites of the
+# generated LaTeX file between several running instances.
+
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    """Exclusive advisory lock held on a separate lock file.
+
+    Uses fcntl.flock on POSIX systems and msvcrt.locking on Windows. The lock
+    is reentrant within a process and also serializes threads. Time spent
+    waiting for another process is recorded, so contention can be reported.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.thread_lock = threading.RLock()
+        self.depth = 0
+        self.handle = None
+        self.last_wait = 0.0
+        self.total_wait = 0.0
+        self.contended = 0
+
+    def _try_lock(self) -> bool:
+        try:
+            if fcntl:
+                fcntl.flock(self.handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                self.handle.seek(0)
+                msvcrt.locking(self.handle.fileno(), msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+
+    def _lock_blocking(self):
+        if fcntl:
+            fcntl.flock(self.handle.fileno(), fcntl.LOCK_EX)
+            return
+        while not self._try_lock():
+            time.sleep(0.05)
+
+    def acquire(self):
+        self.thread_lock.acquire()
+        self.depth += 1
+        if self.depth > 1:
+            return
+        try:
+            self.handle = open(self.path, "a+")
+            self.last_wait = 0.0
+            if not self._try_lock():
+                start = time.monotonic()
+                self._lock_blocking()
+                self.last_wait = time.monotonic() - start
+                self.total_wait += self.last_wait
+                self.contended += 1
+        except BaseException:
+            if self.handle:
+                self.handle.close()
+                self.handle = None
+            self.depth -= 1
+            self.thread_lock.release()
+            raise
+
+    def release(self):
+        self.depth -= 1
+        if self.depth == 0:
+            try:
+                if fcntl:
+                    fcntl.flock(self.handle.fileno(), fcntl.LOCK_UN)
+                else:
+                    self.handle.seek(0)
+                    msvcrt.locking(self.handle.fileno(), msvcrt.LK_UNLCK, 1)
+            finally:
+                self.handle.close()
+                self.handle = None
+        self.thread_lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
@@ -0,0 +1,242 @@
+# french_lexicon.py
+#
+# Offline helpers used to recognise conjugated, inflected or misspelt forms of
+# words that are already in the vocabulary, before any AI request is made.
+# Everything here works on normalized words: lowercase, stripped, no accents
+# (see FrenchVocabBuilder.normalize_word), which is also how normalized_entries
+# is keyed.
+
+from typing import Dict, Iterable, List, Set, Tuple
+
+# Irregular verbs: infinitive -> forms that suffix rules cannot recover.
+# Regular -er/-ir/-re conjugations are handled by the rules below.
+_IRREGULAR_VERBS: Dict[str, str] = {
+    "etre": "suis es est sommes etes sont etais etait etions etiez etaient "
+            "serai seras sera serons serez seront serais serait serions seriez seraient "
+            "ete fus fut furent sois soit soyons soyez soient etant",
+    "avoir": "ai as a avons avez ont avais avait avions aviez avaient "
+             "aurai auras aura aurons aurez auront aurais aurait aurions auriez auraient "
+             "eu eue eus eues eut eurent aie aies ait ayons ayez aient ayant",
+    "aller": "vais vas va allons allez vont allais allait allions alliez allaient "
+             "irai iras ira irons irez iront irais irait irions iriez iraient "
+             "alle allee alles allees aille ailles aillent",
+    "faire": "fais fait faisons faites font faisais faisait faisions faisiez faisaient "
+             "ferai feras fera ferons ferez feront ferais ferait ferions feriez feraient "
+             "faite faits faites fasse fasses fassions fassiez fassent faisant fit firent",
+    "dire": "dis dit disons dites disent disais disait disions disiez disaient "
+            "dirai diras dira dirons direz diront dite dits dise dises disent disant",
+    "pouvoir": "peux peut pouvons pouvez peuvent pouvais pouvait pouvions pouviez pouvaient "
+               "pourrai pourras pourra pourrons pourrez pourront pourrais pourrait pourrions "
+               "pourriez pourraient pu puisse puisses puissions puissiez puissent pouvant",
+    "vouloir": "veux veut voulons voulez veulent voulais voulait voulions vouliez voulaient "
+               "voudrai voudras voudra voudrons voudrez voudront voudrais voudrait voudrions "
+               "voudriez voudraient voulu voulue veuille veuilles veuillent voulant",
+    "savoir": "sais sait savons savez savent savais savait savions saviez savaient "
+              "saurai sauras saura saurons saurez sauront saurais saurait saurions sauriez "
+              "sauraient su sue sache saches sachions sachiez sachent sachant",
+    "voir": "vois voit voyons voyez voient voyais voyait voyions voyiez voyaient "
+            "verrai verras verra verrons verrez verront verrais verrait verrions verriez "
+            "verraient vu vue vus vues voie voies voyant vit virent",
+    "venir": "viens vient venons venez viennent venais venait venions veniez venaient "
+             "viendrai viendras viendra viendrons viendrez viendront viendrais viendrait "
+             "viendrions viendriez viendraient venu venue venus venues vienne viennes venant",
+    "tenir": "tiens tient tenons tenez tiennent tenais tenait tenions teniez tenaient "
+             "tiendrai tiendras tiendra tiendrons tiendrez tiendront tiendrais tiendrait "
+             "tenu tenue tenus tenues tienne tiennes tenant",
+    "prendre": "prends prend prenons prenez prennent prenais prenait prenions preniez prenaient "
+               "prendrai prendras prendra prendrons prendrez prendront pris prise prises "
+               "prenne prennes prenant prit prirent",
+    "mettre": "mets met mettons mettez mettent mettais mettait mettions mettiez mettaient "
+              "mettrai mettras mettra mettrons mettrez mettront mis mise mises mette mettes mettant",
+    "devoir": "dois doit devons devez doivent devais devait devions deviez devaient "
+              "devrai devras devra devrons devrez devront devrais devrait du due dus dues "
+              "doive doives doivent devant",
+    "falloir": "faut fallait faudra faudrait fallu faille",
+    "pleuvoir": "pleut pleuvait pleuvra pleuvrait plu pleuve",
+    "connaitre": "connais connait connaissons connaissez connaissent connaissais connaissait "
+                 "connaitrai connaitra connu connue connus connues connaisse connaissant",
+    "croire": "crois croit croyons croyez croient croyais croyait croirai croira cru crue croie croyant",
+    "boire": "bois boit buvons buvez boivent buvais buvait boirai boira bu bue boive buvant",
+    "vivre": "vis vit vivons vivez vivent vivais vivait vivrai vivra vecu vecue vive vivant",
+    "ecrire": "ecris ecrit ecrivons ecrivez ecrivent ecrivais ecrivait ecrirai ecrira "
+              "ecrite ecrits ecrites ecrive ecrivant",
+    "lire": "lis lit lisons lisez lisent lisais lisait lirai lira lu lue lus lues lise lisant",
+    "ouvrir": "ouvre ouvres ouvrons ouvrez ouvrent ouvrais ouvrait ouvrirai ouvrira "
+              "ouvert ouverte ouverts ouvertes ouvrant",
+    "mourir": "meurs meurt mourons mourez meurent mourais mourait mourrai mourra mort morte morts mortes",
+    "naitre": "nais nait naissons naissez naissent naissais naissait naitrai naitra ne nee nes nees",
+    "recevoir": "recois recoit recevons recevez recoivent recevais recevait recevrai recevra "
+                "recu recue recus recues recoive recevant",
+    "courir": "cours court courons courez courent courais courait courrai courra couru",
+    "partir": "pars part partons partez partent partais partait partirai partira parti partie partis",
+    "sortir": "sors sort sortons sortez sortent sortais sortait sortirai sortira sorti sortie sortis",
+    "dormir": "dors dort dormons dormez dorment dormais dormait dormirai dormira dormi",
+    "sentir": "sens sent sentons sentez sentent sentais sentait sentirai sentira senti",
+    "servir": "sers sert servons servez servent servais servait servirai servira servi",
+    "plaire": "plais plait plaisons plaisez plaisent plaisait plairai plaira plu",
+    "suivre": "suis suit suivons suivez suivent suivais suivait suivrai suivra suivi suivie",
+    "craindre": "crains craint craignons craignez craignent craignais craignait craindrai craindra crainte",
+    "peindre": "peins peint peignons peignez peignent peignais peignait peindrai peindra peinte",
+    "joindre": "joins joint joignons joignez joignent joignais joignait joindrai joindra jointe",
+    "envoyer": "envoie envoies envoient enverrai enverras enverra enverrons enverrez enverront",
+    "asseoir": "assieds assied asseyons asseyez asseyent assis assise assieds",
+    "valoir": "vaux vaut valons valez valent valait vaudra vaudrait valu",
+}
+
+# Inverted table: normalized form -> infinitive. A form that belongs to several
+# verbs (e.g. "suis") keeps every lemma.
+IRREGULAR_FORMS: Dict[str, List[str]] = {}
+for _lemma, _forms in _IRREGULAR_VERBS.items():
+    for _form in _forms.split():
+        IRREGULAR_FORMS.setdefault(_form, [])
+        if _lemma not in IRREGULAR_FORMS[_form]:
+            IRREGULAR_FORMS[_form].append(_lemma)
+
+# Suffix rules: (ending of the inflected form, replacement giving the lemma).
+# Longest endings come first so "eraient" is tried before "ent".
+_VERB_RULES = [
+    ("eraient", "er"), ("iraient", "ir"), ("raient", "re"),
+    ("issaient", "ir"), ("issions", "ir"), ("issiez", "ir"), ("issons", "ir"),
+    ("issez", "ir"), ("issent", "ir"), ("issais", "ir"), ("issait", "ir"), ("issant", "ir"),
+    ("erions", "er"), ("eriez", "er"), ("erons", "er"), ("eront", "er"), ("erais", "er"),
+    ("erait", "er"), ("erai", "er"), ("eras", "er"), ("erez", "er"), ("era", "er"),
+    ("irions", "ir"), ("iriez", "ir"), ("irons", "ir"), ("iront", "ir"), ("irais", "ir"),
+    ("irait", "ir"), ("irai", "ir"), ("iras", "ir"), ("irez", "ir"), ("ira", "ir"),
+    ("rons", "re"), ("ront", "re"), ("rais", "re"), ("rait", "re"), ("rai", "re"),
+    ("ras", "re"), ("rez", "re"), ("ra", "re"),
+    ("aient", "er"), ("aient", "re"), ("ions", "er"), ("ions", "re"), ("iez", "er"), ("iez", "re"),
+    ("ais", "er"), ("ait", "er"), ("ais", "re"), ("ait", "re"),
+    ("ant", "er"), ("ant", "re"), ("ons", "er"), ("ons", "re"), ("ez", "er"), ("ez", "re"),
+    ("ent", "er"), ("ent", "re"), ("ees", "er"), ("ee", "er"), ("es", "er"), ("e", "er"),
+    ("ies", "ir"), ("ie", "ir"), ("is", "ir"), ("it", "ir"), ("i", "ir"),
+    ("ues", "re"), ("ue", "re"), ("us", "re"), ("u", "re"), ("s", "re"), ("t", "re"),
+    ("ames", "er"), ("ates", "er"), ("erent", "er"), ("as", "er"), ("a", "er"),
+]
+
+# Feminine and plural endings of nouns and adjectives: (ending, replacement).
+_NOMINAL_RULES = [
+    ("euses", "eux"), ("euse", "eux"), ("ives", "if"), ("ive", "if"),
+    ("iennes", "ien"), ("ienne", "ien"), ("ennes", "en"), ("enne", "en"),
+    ("elles", "el"), ("elle", "el"), ("ettes", "et"), ("ette", "et"),
+    ("eres", "er"), ("ere", "er"), ("trices", "teur"), ("trice", "teur"),
+    ("aux", "al"), ("eaux", "eau"), ("ales", "al"), ("ale", "al"),
+    ("es", ""), ("s", ""), ("x", ""), ("e", ""),
+]
+
+
+def _reflexive_variants(word: str) -> List[str]:
+    if word.startswith("se "):
+        return [word[3:]]
+    if word.startswith("s'"):
+        return [word[2:]]
+    return ["se " + word, "s'" + word]
+
+
+def lemma_candidates(word: str) -> List[Tuple[str, bool]]:
+    """Returns possible lemmas for a normalized word, most likely first.
+
+    Each candidate comes with whether it was derived as a verb (from a
+    conjugation rule, the irregular verb table or a pronominal form) rather
+    than as a noun or adjective, so callers only match it against known words
+    of that kind: "enfant" gives "enfer" by a verb rule, which must not match
+    the noun "enfer".
+
+    The rules deliberately overgenerate, so a match is only ever a hint that
+    the word may be a form of a known one.
+    """
+    candidates: List[Tuple[str, bool]] = []
+    seen: Set[Tuple[str, bool]] = {(word, True), (word, False)}
+
+    def add(candidate: str, verb: bool):
+        if candidate and (candidate, verb) not in seen:
+            seen.add((candidate, verb))
+            candidates.append((candidate, verb))
+
+    # Pronominal verbs: "se promener" / "s'asseoir" <-> bare infinitive.
+    bare = word
+    if word.startswith("se "):
+        bare = word[3:]
+    elif word.startswith("s'"):
+        bare = word[2:]
+    add(bare, True)
+
+    for lemma in IRREGULAR_FORMS.get(bare, []):
+        add(lemma, True)
+
+    for rules, verb in ((_VERB_RULES, True), (_NOMINAL_RULES, False)):
+        for ending, replacement in rules:
+            if bare.endswith(ending) and len(bare) - len(ending) >= 2:
+                stem = bare[: -len(ending)]
+                add(stem + replacement, verb)
+                # Spelling-change verbs keep an "e" after g ("mangeait" -> "manger").
+                if verb and stem.endswith("ge") and replacement == "er":
+                    add(stem[:-1] + replacement, verb)
+
+    for candidate, verb in list(candidates):
+        if verb:
+            for variant in _reflexive_variants(candidate):
+                add(variant, True)
+    return candidates
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """Optimal string alignment distance, or max_distance + 1 once it is exceeded."""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous2: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_min = current[0]
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+            row_min = min(row_min, current[j])
+        if row_min > max_distance:
+            return max_distance + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class SpellSuggester:
+    """Suggests known words within a small edit distance of a (misspelt) word.
+
+    Uses a symmetric single-deletion index so a lookup touches only the words
+    sharing a one-character deletion with the query, instead of scanning the
+    whole vocabulary.
+    """
+
+    def __init__(self, words: Iterable[str] = (), min_length: int = 5):
+        self.min_length = min_length
+        self.deletes: Dict[str, Set[str]] = {}
+        for word in words:
+            self.add(word)
+
+    @staticmethod
+    def _deletions(word: str) -> Set[str]:
+        return {word} | {word[:i] + word[i + 1:] for i in range(len(word))}
+
+    def add(self, word: str):
+        for key in self._deletions(word):
+            self.deletes.setdefault(key, set()).add(word)
+
+    def suggest(self, word: str, max_distance: int = 2) -> List[str]:
+        """Returns known words closest to word, best first. Exact matches are excluded."""
+        # Shorter words have too many real neighbours one edit away (pain, main, bain...).
+        if len(word) < self.min_length:
+            return []
+        # Allow only one edit on short words to keep false positives down.
+        limit = 1 if len(word) < 7 else max_distance
+        candidates: Set[str] = set()
+        for key in self._deletions(word):
+            candidates |= self.deletes.get(key, set())
+        scored = []
+        for candidate in candidates:
+            if candidate == word:
+                continue
+            distance = edit_distance(word, candidate, limit)
+            if distance <= limit:
+                scored.append((distance, candidate))
+        return [candidate for _, candidate in sorted(scored)]
@@ -0,0 +1,101 @@
+# http_transport.py
+#
+# Pooled HTTP transport shared by every Anthropic API call, with
+# time-to-first-byte measurements.
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+
+import httpx
+from anthropic import DefaultHttpxClient
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+class PooledTransport:
+    """One keep-alive connection pool used by all AI calls.
+
+    Connections stay open for keepalive_expiry seconds after a request, so
+    consecutive queries (and the prefetch threads of a word queue) reuse an
+    established TLS connection instead of paying the handshake each time.
+
+    The time to first byte of every request, from sending it until the
+    response headers arrive, is recorded under the label active on the
+    calling thread ("query" unless set with labelled), so the first and later
+    calls can be compared.
+    """
+
+    def __init__(self, max_connections: int = 10, keepalive_expiry: float = 60.0,
+                 connect_timeout: float = 5.0, timeout: float = 120.0):
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.ttfb: List[Tuple[str, float]] = []
+        self.client = DefaultHttpxClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(timeout, connect=connect_timeout),
+            event_hooks={"request": [self._on_request], "response": [self._on_response]},
+        )
+
+    @classmethod
+    def from_env(cls) -> "PooledTransport":
+        """Reads the pool settings from FRENCH_VOCAB_HTTP_* environment variables."""
+        return cls(
+            max_connections=int(_env_float("FRENCH_VOCAB_HTTP_MAX_CONNECTIONS", 10)),
+            keepalive_expiry=_env_float("FRENCH_VOCAB_HTTP_KEEPALIVE", 60.0),
+            connect_timeout=_env_float("FRENCH_VOCAB_HTTP_CONNECT_TIMEOUT", 5.0),
+            timeout=_env_float("FRENCH_VOCAB_HTTP_TIMEOUT", 120.0),
+        )
+
+    # Both hooks run on the thread sending the request; the response hook
+    # fires once the headers are in, before the body is read.
+    def _on_request(self, request: httpx.Request):
+        self.local.start = time.perf_counter()
+
+    def _on_response(self, response: httpx.Response):
+        ttfb = time.perf_counter() - self.local.start
+        self.local.last_ttfb = ttfb
+        with self.lock:
+            self.ttfb.append((getattr(self.local, "label", "query"), ttfb))
+
+    @contextmanager
+    def labelled(self, label: str) -> Iterator[None]:
+        """Records requests sent by this thread inside the block under label."""
+        previous = getattr(self.local, "label", "query")
+        self.local.label = label
+        try:
+            yield
+        finally:
+            self.local.label = previous
+
+    def last_ttfb(self) -> Optional[float]:
+        """Time to first byte of the last request sent by this thread."""
+        return getattr(self.local, "last_ttfb", None)
+
+    def ttfb_summary(self) -> str:
+        with self.lock:
+            samples = list(self.ttfb)
+        if not samples:
+            return ""
+        parts = [f"warm-up {seconds:.2f}s" for label, seconds in samples if label == "warm-up"][:1]
+        queries = [seconds for label, seconds in samples if label == "query"]
+        if queries:
+            parts.append(f"first query {queries[0]:.2f}s")
+        later = sorted(queries[1:])
+        if later:
+            parts.append(f"later queries median {later[len(later) // 2]:.2f}s ({len(later)} calls)")
+        return "Time to first byte: " + ", ".join(parts) + "."
+
+    def close(self):
+        self.client.close()
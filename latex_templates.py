@@ -1,5 +1,7 @@
 # latex_templates.py
 
+import re
+
 INITIAL_TEX_CONTENT = r"""\documentclass[12pt]{article}
 \usepackage[margin=1in]{geometry}
 \usepackage[utf8]{inputenc}
@@ -41,8 +43,91 @@ FINAL_TEX_CONTENT = r"""
 \end{itemize}
 \end{document}"""
 
-AI_PROMPT_TEMPLATE = f"""
-Please provide information for the French word or expression "{{word}}" in the following format:
+# Markers delimiting the generated list of entries inside the .tex file.
+ENTRIES_BEGIN = r"\begin{itemize}[leftmargin=*]"
+ENTRIES_END = r"\end{itemize}"
+
+# Bump whenever render_latex_entry changes output, so cached renderings are redone.
+LATEX_RENDER_VERSION = "1"
+
+
+def render_latex_entry(word, word_type, definitions, examples):
+    """Formats one vocabulary entry as an \\entry command.
+
+    Args:
+        word (str): The French word.
+        word_type (str): The type of the word (e.g., noun, verb).
+        definitions (List[str]): List of definitions for the word.
+        examples (List[Tuple[str, str]]): List of example tuples (French, English).
+
+    Returns:
+        str: Formatted LaTeX entry for the word.
+    """
+    # Capitalize the first letter only, so names such as "Le Monde" keep their casing
+    capitalized_word = word[:1].upper() + word[1:]
+
+    def_items = "".join([f"    \\item {d}\n" for d in definitions])
+    example_items = "".join(
+        [f"    \\item {e[0]} \\\\ ({e[1]})\n" for e in examples]
+    )
+
+    latex_entry = f"""\\entry{{{capitalized_word}}}{{{word_type}}}
+      {{
+    {def_items.rstrip()}
+      }}
+      {{
+    {example_items.rstrip()}
+      }}"""
+
+    # Remove all square brackets using regex
+    latex_entry = re.sub(r"\[|\]", "", latex_entry)
+
+    return latex_entry
+
+
+def render_entries_chunk(rows):
+    """Renders a chunk of (id, word, word_type, definitions, examples) rows.
+
+    Module-level so it can run in a process pool worker.
+    """
+    return [(row[0], render_latex_entry(*row[1:])) for row in rows]
+
+
+def split_latex_items(text):
+    """Splits the body of an itemize/enumerate block into its \\item texts."""
+    return [item.strip() for item in re.split(r"\\item\s*", text) if item.strip()]
+
+
+def split_latex_example(item):
+    """Splits a rendered example item "French \\\\ (English)" into its two parts."""
+    french, _, english = item.partition("\\\\")
+    english = english.strip()
+    if english.startswith("(") and english.endswith(")"):
+        english = english[1:-1]
+    return french.strip(), english
+
+
+def latex_to_text(item):
+    """Strips LaTeX commands from an item, leaving plain text."""
+    # Remove any LaTeX commands, then undo escapes such as \& added by vocab_lint --fix
+    item = re.sub(r'\\[a-zA-Z]+(\[.*?\])?(\{.*?\})?', '', item).strip()
+    return re.sub(r'\\([&%#$_^])(\{\})?', r'\1', item)
+
+
+def latex_items_to_html(items):
+    """Converts LaTeX items to one bulleted HTML string, as used by Anki notes and TSV exports."""
+    # Add bullet points to each item and join with HTML line breaks
+    items = [latex_to_text(item) for item in items]
+    return '<br>'.join(f'• {item}' for item in items if item)
+
+
+# Static instructions sent as a cacheable system block. Keep anything that
+# varies per request out of this string, otherwise every call misses the cache.
+# The block must also stay above the model's minimum cacheable prefix (1024
+# tokens for Claude 3.5 Sonnet); shorter blocks are silently never cached. The
+# worked examples keep it at about 1,350 tokens and pin down the reply format.
+AI_SYSTEM_PROMPT = """
+You provide information for French words or expressions in the following format:
 
 Spelling Check: [Confirm if the spelling is correct. If not, provide the correct spelling.]
 Correctly Spelt Word: [Use the correct spelling here, whether it's the original word or the corrected version. If the original entry is a VERB, you must conjugate the correctly spelt verb in standard infinitive form.]
@@ -69,4 +154,71 @@ Apply the following criteria:
 7. Provide context-rich examples that demonstrate the word's usage in various situations.
 8. Make sure the English translations accurately reflect the meaning and tone of the French examples.
 9. For verbs, structure the example sentences to show present tense in the first example, past tense in the second example, and future tense in the third example.
-"""
\ No newline at end of file
+10. Reply with the format above only: no introduction, no closing remarks, and no Markdown formatting such as bold text or headings.
+
+Here are worked examples of complete replies. Follow their layout exactly.
+
+Example reply for the input "mangeait" (a conjugated verb, given in the imperfect tense):
+
+Spelling Check: The spelling is correct. "Mangeait" is the third person singular imperfect of the verb "manger".
+Correctly Spelt Word: manger
+Word Type: verb
+Definitions:
+a. To eat; to consume food, whether a meal or a snack
+b. To use up or consume something, such as time, money or energy (e.g. "ce projet mange tout mon temps")
+c. To swallow or slur one's words when speaking (in the expression "manger ses mots")
+Examples:
+1. Nous mangeons toujours en famille le dimanche midi.
+We always eat together as a family on Sunday lunchtime.
+2. Hier soir, ils ont mangé dans un petit restaurant près du port.
+Last night, they ate at a little restaurant near the harbour.
+3. Demain, je mangerai plus tôt pour arriver à l'heure au concert.
+Tomorrow, I will eat earlier so as to arrive at the concert on time.
+
+Example reply for the input "bibliotheque" (a noun with a missing accent):
+
+Spelling Check: The spelling is incorrect. The correct spelling is "bibliothèque", with a grave accent on the second "e".
+Correctly Spelt Word: bibliothèque
+Word Type: noun (feminine)
+Definitions:
+a. A library; a building or room where books are kept for reading or borrowing
+b. A bookcase or set of bookshelves in a home or office
+c. A collection of books, recordings or software components (e.g. "une bibliothèque logicielle", a software library)
+Examples:
+1. La bibliothèque municipale reste ouverte jusqu'à vingt heures le jeudi.
+The town library stays open until eight in the evening on Thursdays.
+2. Il a installé une grande bibliothèque en chêne dans son bureau.
+He put a large oak bookcase in his study.
+3. Cette bibliothèque de disques anciens est la fierté de mon grand-père.
+This collection of old records is my grandfather's pride and joy.
+
+Example reply for the input "agaçante" (a feminine adjective):
+
+Spelling Check: The spelling is correct. "Agaçante" is the feminine form of the adjective "agaçant".
+Correctly Spelt Word: agaçante
+Word Type: adjective
+Definitions:
+a. Annoying, irritating; causing mild but persistent exasperation
+b. Provocative or teasing, especially in a way meant to attract or tease someone (literary)
+Examples:
+1. Cette musique qui passe en boucle dans le magasin est vraiment agaçante.
+This music playing on a loop in the shop is really annoying.
+2. Elle a une manie agaçante de finir les phrases des autres.
+She has an irritating habit of finishing other people's sentences.
+
+Example reply for the input "avoir le cafard" (an expression):
+
+Spelling Check: The spelling is correct.
+Correctly Spelt Word: avoir le cafard
+Word Type: expression
+Definitions:
+a. To feel down, to have the blues; to be in a low, melancholy mood
+b. To feel homesick or gloomy, often without a precise reason (informal)
+Examples:
+1. Depuis que son meilleur ami a déménagé, il a souvent le cafard.
+Since his best friend moved away, he often feels down.
+2. Le dimanche soir, j'avais toujours le cafard avant la rentrée.
+On Sunday evenings, I always felt gloomy before going back to school.
+"""
+
+AI_PROMPT_TEMPLATE = """Please provide information for the French word or expression "{word}" in the format described above."""
@@ -0,0 +1,145 @@
+# pdf_builder.py
+#
+# Optional background compilation of the generated LaTeX file to PDF.
+
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+from typing import List, Optional
+
+
+class PdfBuilder:
+    """Runs latexmk in a worker thread whenever the LaTeX file changes.
+
+    Changes are debounced: a burst of notify_changed calls (e.g. a word queue
+    adding several entries in a row) results in a single build once the file
+    has been quiet for debounce_seconds. latexmk itself only reruns the steps
+    whose inputs changed. If latexmk is not installed, the builder stays
+    disabled and only reports that in its status line.
+    """
+
+    def __init__(self, latex_file: str, debounce_seconds: float = 2.0, timeout: float = 300.0,
+                 latexmk: str = "latexmk"):
+        self.latex_file = os.path.abspath(latex_file)
+        self.debounce_seconds = debounce_seconds
+        self.timeout = timeout
+        self.executable = shutil.which(latexmk)
+        self.condition = threading.Condition()
+        self.last_change: Optional[float] = None
+        self.stopping = False
+        self.building = False
+        self.builds = 0
+        self.last_duration: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.thread: Optional[threading.Thread] = None
+        if self.available:
+            self.thread = threading.Thread(target=self._run, name="pdf-builder", daemon=True)
+            self.thread.start()
+
+    @property
+    def available(self) -> bool:
+        return self.executable is not None
+
+    @property
+    def pdf_file(self) -> str:
+        return os.path.splitext(self.latex_file)[0] + ".pdf"
+
+    def is_stale(self) -> bool:
+        try:
+            return os.path.getmtime(self.pdf_file) < os.path.getmtime(self.latex_file)
+        except OSError:
+            return True
+
+    def notify_changed(self):
+        """Schedules a build; repeated calls within the debounce window are merged."""
+        if not self.available:
+            return
+        with self.condition:
+            self.last_change = time.monotonic()
+            self.condition.notify()
+
+    def command(self) -> List[str]:
+        return [
+            self.executable, "-pdf", "-interaction=nonstopmode", "-halt-on-error", "-silent",
+            f"-outdir={os.path.dirname(self.latex_file)}", self.latex_file,
+        ]
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while self.last_change is None and not self.stopping:
+                    self.condition.wait()
+                if self.last_change is None:
+                    return
+                # Wait until no change has arrived for debounce_seconds (skipped when stopping).
+                while not self.stopping:
+                    remaining = self.last_change + self.debounce_seconds - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.condition.wait(remaining)
+                self.last_change = None
+                self.building = True
+            try:
+                self._build()
+            finally:
+                with self.condition:
+                    self.building = False
+                    self.condition.notify_all()
+
+    def _build(self):
+        start = time.monotonic()
+        try:
+            result = subprocess.run(
+                self.command(), cwd=os.path.dirname(self.latex_file), capture_output=True,
+                text=True, errors="replace", timeout=self.timeout,
+            )
+        except subprocess.TimeoutExpired:
+            error = f"latexmk timed out after {self.timeout:.0f}s"
+        except OSError as e:
+            error = f"could not run latexmk: {e}"
+        else:
+            error = None if result.returncode == 0 else self._first_error(result.stdout + result.stderr)
+        with self.condition:
+            self.builds += 1
+            self.last_duration = time.monotonic() - start
+            self.last_error = error
+
+    def _first_error(self, output: str) -> str:
+        # LaTeX errors start with "!" in the log; prefer those over latexmk's own summary.
+        log_file = os.path.splitext(self.latex_file)[0] + ".log"
+        try:
+            with open(log_file, "r", encoding="utf-8", errors="replace") as f:
+                output = f.read() + "\n" + output
+        except OSError:
+            pass
+        match = re.search(r"^! (.+)$", output, re.MULTILINE)
+        if match:
+            return match.group(1).strip()
+        lines = [line for line in output.splitlines() if line.strip()]
+        return lines[-1].strip() if lines else "latexmk failed"
+
+    def status_line(self) -> str:
+        if not self.available:
+            return "[dim]PDF build: latexmk not found, background builds disabled.[/dim]"
+        with self.condition:
+            if self.building:
+                return "[yellow]PDF build: running...[/yellow]"
+            if self.last_change is not None:
+                return "[yellow]PDF build: queued.[/yellow]"
+            if self.last_duration is None:
+                return "[dim]PDF build: no builds yet.[/dim]"
+            if self.last_error:
+                return f"[bold red]PDF build failed after {self.last_duration:.1f}s: {self.last_error}[/bold red]"
+            return f"[green]PDF build: up to date ({self.last_duration:.1f}s, {os.path.basename(self.pdf_file)}).[/green]"
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stops the worker, building any pending change first without waiting out the debounce."""
+        if self.thread is None:
+            return
+        with self.condition:
+            self.stopping = True
+            self.condition.notify_all()
+        self.thread.join(timeout)
@@ -0,0 +1,222 @@
+# vocab_export.py
+#
+# Streaming text exports of the vocabulary store: TSV (Anki's text import),
+# CSV and JSONL. Entries are read from the store in batches and written in
+# buffered chunks, so memory use stays flat however large the vocabulary is.
+#
+#     python vocab_export.py FrenchVocab.tex vocab.tsv.gz [--resume]
+
+import argparse
+import csv
+import gzip
+import io
+import json
+import os
+import sys
+import time
+from typing import Callable, Dict, Iterable, Iterator, Optional
+
+from latex_templates import latex_items_to_html, latex_to_text
+from vocab_store import VocabStore
+
+FORMATS = ("tsv", "csv", "jsonl")
+# Bytes of output buffered before each write (and cursor update).
+CHUNK_SIZE = 1 << 20
+
+
+def format_from_path(path: str) -> Optional[str]:
+    """Returns the export format implied by a file name such as "vocab.csv.gz"."""
+    name = path[:-3] if path.endswith(".gz") else path
+    extension = os.path.splitext(name)[1].lstrip(".").lower()
+    return extension if extension in FORMATS else None
+
+
+def tsv_lines(entries: Iterable[Dict]) -> Iterator[str]:
+    # Header lines understood by Anki's text importer; fields use the same HTML as the .apkg notes.
+    yield "#separator:tab\n#html:true\n#columns:French\tType\tEnglish\tExample\n"
+    for entry in entries:
+        fields = [
+            entry["word"],
+            entry["type"],
+            latex_items_to_html(entry["definitions"]),
+            latex_items_to_html([f"{french}<br>({english})" for french, english in entry["examples"]]),
+        ]
+        yield "\t".join(" ".join(field.split()) for field in fields) + "\n"
+
+
+def csv_lines(entries: Iterable[Dict]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def line(row) -> str:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(row)
+        return buffer.getvalue()
+
+    yield line(["word", "type", "definitions", "examples"])
+    for entry in entries:
+        yield line([
+            entry["word"],
+            entry["type"],
+            "\n".join(latex_to_text(d) for d in entry["definitions"]),
+            "\n".join(f"{latex_to_text(f)} ({latex_to_text(e)})" for f, e in entry["examples"]),
+        ])
+
+
+def jsonl_lines(entries: Iterable[Dict]) -> Iterator[str]:
+    for entry in entries:
+        yield json.dumps({
+            "word": entry["word"],
+            "type": entry["type"],
+            "definitions": [latex_to_text(d) for d in entry["definitions"]],
+            "examples": [[latex_to_text(f), latex_to_text(e)] for f, e in entry["examples"]],
+        }, ensure_ascii=False) + "\n"
+
+
+LINE_WRITERS: Dict[str, Callable[[Iterable[Dict]], Iterator[str]]] = {
+    "tsv": tsv_lines,
+    "csv": csv_lines,
+    "jsonl": jsonl_lines,
+}
+
+
+def stream_export(store: VocabStore, path: str, fmt: Optional[str] = None, compress: Optional[bool] = None,
+                  resume: bool = False, chunk_size: int = CHUNK_SIZE) -> Dict:
+    """Writes every entry of the store to path, one buffered chunk at a time.
+
+    After each chunk, a cursor file (path + ".cursor") records how far the
+    export got. With resume=True an interrupted export continues from there
+    instead of starting over; the cursor is removed once the export completes.
+    With compress, each chunk is written as its own gzip member, so the file
+    is a valid gzip stream after every chunk and can be truncated back to the
+    last one on resume.
+
+    Entries added since an interrupted export are included on resume only if
+    they sort after the last exported entry.
+
+    Args:
+        store: The vocabulary store to export.
+        path: Output file.
+        fmt: "tsv", "csv" or "jsonl". Defaults to the format implied by path.
+        compress: Gzip the output. Defaults to whether path ends in ".gz".
+        resume: Continue an interrupted export of the same file if possible.
+        chunk_size: Approximate number of bytes buffered per write.
+
+    Returns:
+        Dict: The path, format, number of entries written, file size, and
+            whether the export was resumed.
+
+    Raises:
+        ValueError: If the format is unknown or a resumed export used a
+            different format.
+    """
+    fmt = fmt or format_from_path(path)
+    if fmt not in LINE_WRITERS:
+        raise ValueError(f"Unknown export format {fmt!r}; choose one of {', '.join(FORMATS)}")
+    if compress is None:
+        compress = path.endswith(".gz")
+
+    cursor_file = path + ".cursor"
+    cursor = None
+    if resume and os.path.exists(cursor_file) and os.path.exists(path):
+        with open(cursor_file, "r", encoding="utf-8") as f:
+            cursor = json.load(f)
+        if cursor["format"] != fmt or cursor["compress"] != compress:
+            raise ValueError(f"{path} was started as {cursor['format']}"
+                             f"{' (gzip)' if cursor['compress'] else ''}; cannot resume as {fmt}")
+
+    start = time.time()
+    rows = cursor["rows"] if cursor else 0
+    position = tuple(cursor["position"]) if cursor and cursor["position"] else None
+    entries = store.iter_entries(after=position)
+
+    def tracked(entries: Iterable[Dict]) -> Iterator[Dict]:
+        nonlocal rows, position
+        for entry in entries:
+            rows += 1
+            position = entry["position"]
+            yield entry
+
+    lines = LINE_WRITERS[fmt](tracked(entries))
+    if cursor:
+        if fmt in ("tsv", "csv"):
+            next(lines)  # The header is already in the file.
+        file = open(path, "r+b")
+        file.truncate(cursor["offset"])
+        file.seek(cursor["offset"])
+    else:
+        file = open(path, "wb")
+
+    def write(chunk: str):
+        data = chunk.encode("utf-8")
+        file.write(gzip.compress(data) if compress else data)
+        file.flush()
+        os.fsync(file.fileno())
+        # Only record progress once the chunk is on disk.
+        temp_file = cursor_file + ".tmp"
+        with open(temp_file, "w", encoding="utf-8") as f:
+            json.dump({"format": fmt, "compress": compress, "offset": file.tell(),
+                       "position": position, "rows": rows}, f)
+        os.replace(temp_file, cursor_file)
+
+    with file:
+        buffer = []
+        buffered = 0
+        for line in lines:
+            buffer.append(line)
+            buffered += len(line)
+            if buffered >= chunk_size:
+                write("".join(buffer))
+                buffer.clear()
+                buffered = 0
+        if buffer:
+            write("".join(buffer))
+        size = file.tell()
+
+    if os.path.exists(cursor_file):
+        os.remove(cursor_file)
+    store.add_stats([("text_exports", fmt, 1)])
+    return {
+        "path": path,
+        "format": fmt,
+        "entries": rows,
+        "bytes": size,
+        "resumed": cursor is not None,
+        "seconds": round(time.time() - start, 3),
+    }
+
+
+def run_export(latex_file: str, path: str, fmt: Optional[str] = None, compress: Optional[bool] = None,
+               resume: bool = False) -> int:
+    """Exports the store belonging to latex_file. Returns the process exit code."""
+    store_file = os.path.splitext(latex_file)[0] + ".db"
+    if not os.path.exists(store_file):
+        print(f"No vocabulary store found at {store_file}; run FrenchVocab.py once to create it.")
+        return 1
+    store = VocabStore(store_file)
+    try:
+        result = stream_export(store, path, fmt=fmt, compress=compress, resume=resume)
+    except ValueError as e:
+        print(e)
+        return 1
+    finally:
+        store.close()
+    print(f"{'Resumed and finished' if result['resumed'] else 'Wrote'} {result['path']}: "
+          f"{result['entries']} entries, {result['bytes']} bytes in {result['seconds']:.2f}s")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a French vocabulary to TSV, CSV or JSONL.")
+    parser.add_argument("latex_file", help="the vocabulary's LaTeX file (its .db store is exported)")
+    parser.add_argument("output", help="output file, e.g. vocab.tsv, vocab.csv.gz or vocab.jsonl")
+    parser.add_argument("--format", choices=FORMATS, help="defaults to the output file's extension")
+    parser.add_argument("--gzip", action="store_true", default=None, help="compress (default: if output ends in .gz)")
+    parser.add_argument("--resume", action="store_true", help="continue an interrupted export of the same file")
+    args = parser.parse_args()
+    sys.exit(run_export(args.latex_file, args.output, fmt=args.format, compress=args.gzip, resume=args.resume))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+# vocab_lint.py
+#
+# Validates every \entry in the vocabulary LaTeX file and optionally fixes what
+# can be fixed automatically. Runs without an API key or the rest of the app,
+# so it can be used as a pre-commit step:
+#
+#     python vocab_lint.py FrenchVocab.tex [--fix] [--json] [--report lint.json]
+
+import argparse
+import contextlib
+import json
+import os
+import re
+import sys
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from file_lock import FileLock
+from latex_templates import ENTRIES_BEGIN, ENTRIES_END, render_latex_entry, split_latex_items, split_latex_example
+
+ENTRY_START = b"\\entry{"
+
+# Characters that break compilation unless escaped (or inside math, which entries never use).
+SPECIAL_CHARACTERS = re.compile(r"(?<!\\)[&%#$_^]")
+SPECIAL_ESCAPES = {"&": r"\&", "%": r"\%", "#": r"\#", "$": r"\$", "_": r"\_", "^": r"\^{}"}
+
+# Entries per process pool task; large enough that pickling, not scheduling, dominates.
+BATCH_SIZE = 5000
+# Below this many entries, checking inline is faster than starting a pool.
+PARALLEL_THRESHOLD = 5000
+
+# code: (severity, fixable, description)
+CHECKS = {
+    "unbalanced-braces": ("error", False, "Unbalanced braces"),
+    "malformed-entry": ("error", False, "Entry does not have four brace-delimited arguments"),
+    "unescaped-special": ("error", True, "Unescaped LaTeX special character"),
+    "stray-bracket": ("warning", True, "Stray square bracket"),
+    "missing-definitions": ("warning", False, "Entry has no definitions"),
+    "missing-examples": ("warning", False, "Entry has no examples"),
+    "missing-translation": ("warning", False, "Example has no English translation"),
+    "duplicate-entry": ("warning", False, "Word appears more than once"),
+}
+
+
+def normalize_word(word: str) -> str:
+    # Same normalization as FrenchVocabBuilder.normalize_word.
+    word = word.lower().strip()
+    return ''.join(c for c in unicodedata.normalize('NFD', word) if unicodedata.category(c) != 'Mn')
+
+
+def split_chunks(content: bytes) -> Tuple[List[Tuple[int, bytes]], int]:
+    """Splits the file into (byte offset, bytes) chunks, one per \\entry.
+
+    Returns the chunks plus the byte offset where the entries section ends;
+    the last chunk runs up to it.
+    """
+    begin = content.find(ENTRIES_BEGIN.encode())
+    end = content.rfind(ENTRIES_END.encode())
+    if begin == -1 or end == -1 or end < begin:
+        begin, end = 0, len(content)
+    else:
+        begin += len(ENTRIES_BEGIN)
+    starts = []
+    position = content.find(ENTRY_START, begin, end)
+    while position != -1:
+        starts.append(position)
+        position = content.find(ENTRY_START, position + 1, end)
+    chunks = [(start, content[start:stop]) for start, stop in zip(starts, starts[1:] + [end])]
+    return chunks, end
+
+
+BRACE = re.compile(r"(?<!\\)[{}]")
+
+
+def brace_groups(text: str) -> Tuple[List[Tuple[int, int]], Optional[int], int]:
+    """Scans the unescaped braces of text.
+
+    Returns:
+        Tuple: The (start, end) spans of the top-level brace groups' contents,
+            the index of the first closing brace without an opening one (or
+            None), and the number of braces left open at the end.
+    """
+    spans = []
+    depth = 0
+    group_start = 0
+    for match in BRACE.finditer(text):
+        if match.group() == "{":
+            if depth == 0:
+                group_start = match.end()
+            depth += 1
+        else:
+            depth -= 1
+            if depth < 0:
+                return spans, match.start(), 0
+            if depth == 0:
+                spans.append((group_start, match.start()))
+    return spans, None, depth
+
+
+def entry_spans(text: str, groups: List[Tuple[int, int]]) -> Optional[List[Tuple[int, int]]]:
+    """Returns the spans of the four arguments following \\entry, or None if the chunk is malformed.
+
+    The arguments must follow each other separated by whitespace only.
+    """
+    spans = groups[:4] if len(groups) >= 4 else None
+    if spans:
+        gaps = [text[len("\\entry"):spans[0][0] - 1]]
+        gaps += [text[end + 1:start - 1] for (_, end), (start, _) in zip(spans, spans[1:])]
+        if any(gap.strip() for gap in gaps):
+            spans = None
+    return spans
+
+
+def lint_chunk(offset: int, data: bytes, fix: bool) -> Dict:
+    """Checks one entry chunk; with fix, also returns the fixed chunk if anything changed."""
+    text = data.decode("utf-8", errors="replace")
+    issues = []
+
+    def byte_offset(index: int) -> int:
+        return offset + len(text[:index].encode("utf-8"))
+
+    def report(code: str, index: int, detail: str = ""):
+        severity, fixable, description = CHECKS[code]
+        issues.append({
+            "code": code,
+            "severity": severity,
+            "fixable": fixable,
+            "offset": byte_offset(index),
+            "message": f"{description}{': ' + detail if detail else ''}",
+        })
+
+    groups, unmatched, unclosed = brace_groups(text)
+    if unmatched is not None:
+        report("unbalanced-braces", unmatched, "closing brace without an opening one")
+    if unclosed:
+        report("unbalanced-braces", groups[-1][1] + 1 if groups else 0, f"{unclosed} unclosed brace(s)")
+
+    spans = entry_spans(text, groups)
+    body_end = spans[-1][1] + 1 if spans else len(text.rstrip())
+    body = text[:body_end]
+
+    # Best guess at the word for the report, even when the entry is malformed.
+    word = text[groups[0][0]:groups[0][1]] if groups else ""
+    fields = None
+    if not spans:
+        report("malformed-entry", 0)
+    else:
+        word, word_type, definitions_text, examples_text = (text[a:b] for a, b in spans)
+        definitions = split_latex_items(definitions_text)
+        examples = [split_latex_example(item) for item in split_latex_items(examples_text)]
+        if not definitions:
+            report("missing-definitions", spans[2][0])
+        if not examples:
+            report("missing-examples", spans[3][0])
+        for french, english in examples:
+            if not english:
+                report("missing-translation", spans[3][0], french[:40])
+        fields = (word, word_type, definitions, examples)
+
+    for match in re.finditer(r"[\[\]]", body):
+        report("stray-bracket", match.start())
+    for match in SPECIAL_CHARACTERS.finditer(body):
+        report("unescaped-special", match.start(), repr(match.group()))
+
+    result = {"offset": offset, "word": word.strip(), "issues": issues, "fixed": None, "fields": None}
+    fixable = {issue["code"] for issue in issues if CHECKS[issue["code"]][1]}
+    if fix and fields and fixable and not any(i["code"] == "unbalanced-braces" for i in issues):
+        def clean(value: str) -> str:
+            value = re.sub(r"[\[\]]", "", value)
+            return SPECIAL_CHARACTERS.sub(lambda m: SPECIAL_ESCAPES[m.group()], value)
+
+        # Fix each argument in place; everything else in the entry is kept as written.
+        arguments = [clean(text[a:b]) for a, b in spans]
+        bounds = [0] + [index for span in spans for index in span] + [body_end]
+        between = [text[bounds[i]:bounds[i + 1]] for i in range(0, len(bounds), 2)]
+        fixed = between[0] + "".join(argument + rest for argument, rest in zip(arguments, between[1:]))
+        word, word_type, definitions_text, examples_text = arguments
+        result["fixed"] = fixed + text[body_end:]
+        result["fields"] = (
+            word.strip(),
+            word_type.strip(),
+            split_latex_items(definitions_text),
+            [split_latex_example(item) for item in split_latex_items(examples_text)],
+        )
+        result["original"] = body
+        for issue in issues:
+            issue["fixed"] = issue["code"] in fixable
+    return result
+
+
+def lint_batch(batch: List[Tuple[int, bytes]], fix: bool) -> List[Dict]:
+    """Module-level so it can run in a process pool worker."""
+    return [lint_chunk(offset, data, fix) for offset, data in batch]
+
+
+def update_store(latex_file: str, fixed: List[Dict]) -> int:
+    """Applies fixes to the vocabulary store, so the next build does not undo them."""
+    store_file = os.path.splitext(latex_file)[0] + ".db"
+    if not fixed or not os.path.exists(store_file):
+        return 0
+    from vocab_store import VocabStore
+    store = VocabStore(store_file)
+    try:
+        return store.update_rendered_entries([
+            (result["original"], result["fields"][0], normalize_word(result["fields"][0]),
+             *result["fields"][1:], result["fixed"].rstrip())
+            for result in fixed
+        ])
+    finally:
+        store.close()
+
+
+def lint_file(latex_file: str, fix: bool = False, workers: Optional[int] = None) -> Dict:
+    """Lints every entry of latex_file, optionally fixing issues in a single rewrite.
+
+    Returns:
+        Dict: A machine-readable report. Each issue carries the byte offset of
+            the offending character in the file as it was read.
+    """
+    start = time.time()
+    # With fix, the lock is held from the read until the rewrite, so a build by
+    # another process cannot land in between and be overwritten.
+    with FileLock(latex_file + ".lock") if fix else contextlib.nullcontext():
+        with open(latex_file, "rb") as f:
+            content = f.read()
+        chunks, end = split_chunks(content)
+
+        if len(chunks) < PARALLEL_THRESHOLD or (os.cpu_count() or 1) < 2:
+            results = lint_batch(chunks, fix)
+        else:
+            batches = [chunks[i:i + BATCH_SIZE] for i in range(0, len(chunks), BATCH_SIZE)]
+            results = []
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for batch_results in executor.map(lint_batch, batches, [fix] * len(batches)):
+                    results.extend(batch_results)
+
+        # Duplicates need every word at once, so they are checked here rather than in the workers.
+        first_seen: Dict[str, int] = {}
+        for result in results:
+            key = normalize_word(result["word"])
+            if not key:
+                continue
+            if key in first_seen:
+                severity, fixable, description = CHECKS["duplicate-entry"]
+                result["issues"].append({
+                    "code": "duplicate-entry", "severity": severity, "fixable": fixable,
+                    "offset": result["offset"],
+                    "message": f"{description}: first at byte {first_seen[key]}",
+                })
+            else:
+                first_seen[key] = result["offset"]
+
+        fixed = [result for result in results if result["fixed"] is not None]
+        store_updates = 0
+        if fix and fixed:
+            store_updates = update_store(latex_file, fixed)
+            fixed_by_offset = {result["offset"]: result["fixed"].encode("utf-8") for result in fixed}
+            # Chunks are contiguous, so everything outside them is copied unchanged.
+            new_content = content[:chunks[0][0]] + b"".join(
+                fixed_by_offset.get(offset, data) for offset, data in chunks
+            ) + content[end:]
+            temp_file = f"{latex_file}.{os.getpid()}.tmp"
+            with open(temp_file, "wb") as f:
+                f.write(new_content)
+            os.replace(temp_file, latex_file)
+
+    issues = [
+        dict(issue, word=result["word"])
+        for result in results
+        for issue in result["issues"]
+    ]
+    issues.sort(key=lambda issue: issue["offset"])
+    remaining = [issue for issue in issues if not issue.get("fixed")]
+    summary: Dict[str, int] = {}
+    for issue in remaining:
+        summary[issue["code"]] = summary.get(issue["code"], 0) + 1
+    return {
+        "file": latex_file,
+        "entries": len(chunks),
+        "issues": issues,
+        "errors": sum(1 for issue in remaining if issue["severity"] == "error"),
+        "warnings": sum(1 for issue in remaining if issue["severity"] == "warning"),
+        "fixed_entries": len(fixed) if fix else 0,
+        "store_entries_updated": store_updates,
+        "summary": summary,
+        "seconds": round(time.time() - start, 3),
+    }
+
+
+def print_report(report: Dict):
+    for issue in report["issues"]:
+        status = " (fixed)" if issue.get("fixed") else ""
+        print(f"{report['file']}:{issue['offset']}: {issue['severity']}: [{issue['code']}] "
+              f"{issue['word'] or '?'}: {issue['message']}{status}")
+    print(f"{report['entries']} entries checked in {report['seconds']:.2f}s: "
+          f"{report['errors']} error(s), {report['warnings']} warning(s)"
+          + (f", {report['fixed_entries']} entries fixed" if report["fixed_entries"] else "")
+          + (f" ({report['store_entries_updated']} in the store)" if report["store_entries_updated"] else ""))
+
+
+def run_lint(latex_file: str, fix: bool = False, as_json: bool = False,
+             report_file: Optional[str] = None) -> int:
+    """Lints the file and prints or saves the report. Returns the process exit code."""
+    report = lint_file(latex_file, fix=fix)
+    if report_file:
+        with open(report_file, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if as_json:
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        print_report(report)
+    return 1 if report["errors"] else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate the entries of a French vocabulary LaTeX file.")
+    parser.add_argument("latex_file", nargs="?", default="FrenchVocab.tex")
+    parser.add_argument("--fix", action="store_true", help="fix fixable issues in a single rewrite")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--report", help="also write the JSON report to this file")
+    args = parser.parse_args()
+    sys.exit(run_lint(args.latex_file, fix=args.fix, as_json=args.json, report_file=args.report))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+# vocab_service.py
+#
+# Long-running local HTTP/JSON service around a single FrenchVocabBuilder, so
+# several people can share one vocabulary without each paying startup and
+# racing on writes.
+
+import json
+import queue
+import threading
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from rich.console import Console
+
+console = Console()
+
+
+class WriteQueue:
+    """Runs every write on one worker thread, in submission order.
+
+    Reads never go through the queue; they work on the builder's in-memory
+    entries directly and can run concurrently with each other and with a write.
+    """
+
+    def __init__(self):
+        self.jobs: "queue.Queue[Optional[Tuple[Callable, Future]]]" = queue.Queue()
+        self.thread = threading.Thread(target=self._run, name="vocab-writer", daemon=True)
+        self.thread.start()
+
+    def submit(self, job: Callable) -> Future:
+        future: Future = Future()
+        self.jobs.put((job, future))
+        return future
+
+    def _run(self):
+        while True:
+            item = self.jobs.get()
+            if item is None:
+                return
+            job, future = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(job())
+            except Exception as e:
+                future.set_exception(e)
+
+    def stop(self):
+        self.jobs.put(None)
+        self.thread.join()
+
+
+class ServiceError(Exception):
+    def __init__(self, status: int, message: str, **details):
+        super().__init__(message)
+        self.status = status
+        self.details = dict(details, error=message)
+
+
+class VocabService:
+    """Serves lookup, search, add and export for one vocabulary over local HTTP.
+
+    The builder passed in stays warm for the lifetime of the service: parsed
+    entries, secondary indexes, the spell suggester and the Anthropic client
+    are loaded once. Requests are handled on one thread each; adds and
+    exports are serialized through a WriteQueue.
+
+    Endpoints:
+        GET  /health
+        GET  /lookup?word=...
+        GET  /search?q=...&type=...&letter=...&limit=...
+        GET  /stats
+        POST /add     {"word": ..., "force": false, "accept_spelling": true}
+        POST /export  {"deck_name": ..., "word_types": [...], "partition_by": "type" | "letter"}
+
+    Args:
+        builder: The FrenchVocabBuilder to serve.
+        fetch: Function returning the raw AI response for a word. Defaults to
+            builder.fetch_ai_response; tests can pass a stub instead.
+    """
+
+    def __init__(self, builder, host: str = "127.0.0.1", port: int = 8765,
+                 fetch: Optional[Callable[[str], str]] = None):
+        self.builder = builder
+        self.fetch = fetch or builder.fetch_ai_response
+        # Build the spell suggester now rather than on the first /lookup or /add.
+        builder.get_spell_suggester()
+        self.writes = WriteQueue()
+        self.server = ThreadingHTTPServer((host, port), self._handler_class())
+        self.server.daemon_threads = True
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self.server.server_address[:2]
+
+    def serve_forever(self):
+        host, port = self.address
+        console.print(f"[bold green]Serving {len(self.builder.word_entries)} entries on http://{host}:{port}[/bold green]")
+        try:
+            self.server.serve_forever()
+        except KeyboardInterrupt:
+            console.print("[yellow]Shutting down.[/yellow]")
+        finally:
+            self.close()
+
+    def start(self) -> threading.Thread:
+        """Serves in a background thread (used when embedding the service, e.g. in tests)."""
+        thread = threading.Thread(target=self.server.serve_forever, name="vocab-service", daemon=True)
+        thread.start()
+        return thread
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.writes.stop()
+
+    # Reads
+
+    def entry_json(self, word: str) -> Dict:
+        return self.builder.word_entries[word.lower()].to_dict()
+
+    def lookup(self, params: Dict) -> Dict:
+        word = params.get("word", "").strip()
+        if not word:
+            raise ServiceError(400, "Missing 'word' parameter")
+        existing = self.builder.find_existing_entry(word) or self.builder.suggest_existing_entry(word)
+        if not existing:
+            raise ServiceError(404, f"'{word}' is not in the vocabulary")
+        existing_word, reason = existing
+        return {"match": reason or "exact", "entry": self.entry_json(existing_word)}
+
+    def search(self, params: Dict) -> Dict:
+        query = self.builder.normalize_word(params.get("q", ""))
+        try:
+            limit = max(1, int(params.get("limit", 50)))
+        except ValueError:
+            raise ServiceError(400, "'limit' must be an integer")
+
+        # Narrow down with the secondary indexes before looking at any entry.
+        if params.get("type"):
+            candidates = set(self.builder.words_of_type(params["type"]))
+        else:
+            candidates = set(self.builder.word_entries)
+        if params.get("letter"):
+            candidates &= set(self.builder.entries_by_letter.get(params["letter"].upper(), ()))
+
+        entries = self.builder.word_entries
+        ranked: List[Tuple[int, str]] = []
+        for word in candidates:
+            entry = entries.get(word)
+            if entry is None:
+                continue
+            normalized = self.builder.normalize_word(word)
+            if normalized.startswith(query):
+                ranked.append((0, word))
+            elif query in normalized:
+                ranked.append((1, word))
+            elif any(query in definition.lower() for definition in entry.definitions):
+                ranked.append((2, word))
+        ranked.sort()
+        return {
+            "total": len(ranked),
+            "results": [entries[word].to_dict() for _, word in ranked[:limit]],
+        }
+
+    # Writes
+
+    def add(self, body: Dict) -> Dict:
+        word = str(body.get("word", "")).strip().replace("’", "'")
+        force = bool(body.get("force", False))
+        error = self.builder.validate_word_input(word)
+        if error:
+            raise ServiceError(400, error)
+
+        existing = None if force else self.builder.find_existing_entry(word)
+        if existing:
+            existing_word, reason = existing
+            raise ServiceError(409, reason or f"'{word}' already exists as '{existing_word}'",
+                               entry=self.entry_json(existing_word))
+        # A possible form or misspelling of a known word is reported with the result but does not stop the add.
+        suggestion = None if force else self.builder.suggest_existing_entry(word)
+
+        # The AI call runs on this request's thread, so slow queries do not hold up other writes.
+        try:
+            ai_response = self.fetch(word)
+        except Exception as e:
+            raise ServiceError(502, f"Error querying AI: {e}")
+        if body.get("accept_spelling", True):
+            word = self.builder.extract_corrected_spelling(ai_response) or word
+
+        word_type, definitions, examples = self.builder.parse_ai_response(ai_response)
+        word_type = ", ".join(word_type) if isinstance(word_type, list) else word_type
+        if not definitions or not examples:
+            raise ServiceError(502, "AI response could not be parsed", response=ai_response)
+
+        def write():
+            # Re-check under the writer: another request or process may have added the word meanwhile.
+            self.builder.refresh_entries()
+            if not force and self.builder.check_duplicate(word):
+                raise ServiceError(409, f"'{word}' was added by another request",
+                                   entry=self.entry_json(self.builder.check_duplicate(word)))
+            self.builder.save_entry(word, word_type, definitions, examples)
+            result = {"entry": self.entry_json(word)}
+            if suggestion:
+                result["hint"] = suggestion[1]
+            return result
+
+        return self.writes.submit(write).result()
+
+    def export(self, body: Dict) -> Dict:
+        deck_name = str(body.get("deck_name") or "French Vocabulary")
+        error = self.builder.validate_deck_name(deck_name)
+        if error:
+            raise ServiceError(400, error)
+        partition_by = body.get("partition_by")
+        if partition_by not in (None, "type", "letter"):
+            raise ServiceError(400, "'partition_by' must be 'type' or 'letter'")
+        labels = body.get("word_types") or []
+        if not isinstance(labels, list) or not all(isinstance(label, str) for label in labels):
+            raise ServiceError(400, "'word_types' must be a list of strings")
+        unknown = self.builder.unknown_word_types(labels)
+        if unknown:
+            raise ServiceError(400, f"Unknown word type(s): {', '.join(unknown)}")
+        word_types = self.builder.parse_word_types(labels) or None
+        packages = self.writes.submit(
+            lambda: self.builder.export_to_anki(deck_name, word_types=word_types, partition_by=partition_by)
+        ).result()
+        return {"packages": packages}
+
+    def _handler_class(self):
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            routes = {
+                ("GET", "/health"): lambda params: {"status": "ok", "entries": len(service.builder.word_entries)},
+                ("GET", "/lookup"): service.lookup,
+                ("GET", "/search"): service.search,
+                ("GET", "/stats"): lambda params: service.builder.statistics(),
+                ("POST", "/add"): service.add,
+                ("POST", "/export"): service.export,
+            }
+
+            def _dispatch(self, method: str):
+                url = urlparse(self.path)
+                route = self.routes.get((method, url.path))
+                try:
+                    if route is None:
+                        raise ServiceError(404, f"No route for {method} {url.path}")
+                    if method == "GET":
+                        payload = {key: values[-1] for key, values in parse_qs(url.query).items()}
+                    else:
+                        length = int(self.headers.get("Content-Length") or 0)
+                        try:
+                            payload = json.loads(self.rfile.read(length) or b"{}")
+                        except json.JSONDecodeError:
+                            raise ServiceError(400, "Request body must be JSON")
+                        if not isinstance(payload, dict):
+                            raise ServiceError(400, "Request body must be a JSON object")
+                    status, body = 200, route(payload)
+                except ServiceError as e:
+                    status, body = e.status, e.details
+                except Exception as e:
+                    status, body = 500, {"error": str(e)}
+                data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._dispatch("GET")
+
+            def do_POST(self):
+                self._dispatch("POST")
+
+            def log_message(self, format, *args):
+                console.print(f"[dim]{self.address_string()} {format % args}[/dim]")
+
+        return Handler
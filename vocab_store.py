@@ -0,0 +1,340 @@
+# vocab_store.py
+#
+# Canonical structured storage for vocabulary entries. The LaTeX file is
+# generated from this store (see FrenchVocabBuilder.build_latex) and is no
+# longer parsed back on every operation.
+
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    word TEXT NOT NULL,
+    sort_key TEXT NOT NULL,
+    word_type TEXT NOT NULL,
+    definitions TEXT NOT NULL,
+    examples TEXT NOT NULL,
+    rendered TEXT,
+    updated_at REAL NOT NULL,
+    verbatim INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS entries_sort_key ON entries (sort_key, id);
+CREATE INDEX IF NOT EXISTS entries_unrendered ON entries (id) WHERE rendered IS NULL;
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS stats (
+    name TEXT NOT NULL,
+    bucket TEXT NOT NULL DEFAULT '',
+    value REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (name, bucket)
+);
+"""
+
+# Bump when the aggregates derived from the entries table change, so they are recomputed once.
+STATS_VERSION = "1"
+
+
+class VocabStore:
+    """SQLite-backed store of words, word types, definitions and example pairs.
+
+    Definitions are stored as a JSON list and examples as a JSON list of
+    [french, english] pairs. Each row also caches its rendered LaTeX; a NULL
+    rendering marks the entry as changed, so a build only re-renders those.
+    Verbatim rows hold an imported \entry block that could not be parsed;
+    their original text is kept as the rendering and never re-rendered.
+
+    Several processes may share one store. Every change bumps the
+    content_version meta value in the same transaction, which lets a build
+    tell whether another process has already written the current content.
+
+    The stats table holds running totals, e.g. ("entries_by_type", "verb"),
+    updated in the same transaction as each insert, so statistics can be
+    shown without reading the entries. Callers add their own totals (API
+    spend, exports) with add_stats.
+    """
+
+    def __init__(self, path: str, timeout: float = 30.0):
+        self.path = path
+        self.lock = threading.Lock()
+        # The timeout makes concurrent writers from other processes wait instead of failing.
+        self.connection = sqlite3.connect(path, timeout=timeout, check_same_thread=False)
+        self.connection.executescript(SCHEMA)
+        columns = {row[1] for row in self.connection.execute("PRAGMA table_info(entries)")}
+        if "verbatim" not in columns:
+            with self.connection:
+                self.connection.execute("ALTER TABLE entries ADD COLUMN verbatim INTEGER NOT NULL DEFAULT 0")
+        if self.get_meta("stats_version") != STATS_VERSION:
+            self._rebuild_entry_stats()
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+    @staticmethod
+    def _row_values(word: str, sort_key: str, word_type: str, definitions: Sequence[str],
+                    examples: Sequence[Tuple[str, str]]) -> Tuple:
+        return (
+            word,
+            sort_key,
+            word_type,
+            json.dumps(list(definitions), ensure_ascii=False),
+            json.dumps([list(example) for example in examples], ensure_ascii=False),
+            time.time(),
+        )
+
+    @staticmethod
+    def _decode(row: Tuple) -> Dict:
+        return {
+            "id": row[0],
+            "word": row[1],
+            "type": row[2],
+            "definitions": json.loads(row[3]),
+            "examples": [tuple(example) for example in json.loads(row[4])],
+        }
+
+    def add(self, word: str, sort_key: str, word_type: str, definitions: Sequence[str],
+            examples: Sequence[Tuple[str, str]]) -> int:
+        """Adds an entry and returns its id. The entry is left unrendered."""
+        with self.lock, self.connection:
+            values = self._row_values(word, sort_key, word_type, definitions, examples)
+            cursor = self.connection.execute(
+                "INSERT INTO entries (word, sort_key, word_type, definitions, examples, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                values,
+            )
+            self._count_entries([values])
+            self._bump_content_version()
+            return cursor.lastrowid
+
+    def add_many(self, entries: Sequence[Tuple]) -> int:
+        """Adds (word, sort_key, word_type, definitions, examples) tuples in one transaction."""
+        with self.lock, self.connection:
+            rows = [self._row_values(*entry) for entry in entries]
+            self.connection.executemany(
+                "INSERT INTO entries (word, sort_key, word_type, definitions, examples, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._count_entries(rows)
+            self._bump_content_version()
+        return len(entries)
+
+    def import_entries(self, entries: Sequence[Tuple]) -> int:
+        """Adds (word, sort_key, word_type, definitions, examples, rendered, verbatim) tuples.
+
+        Used for the one-time import of an existing LaTeX file: rendered is the
+        entry's original text, so importing does not reformat it.
+        """
+        with self.lock, self.connection:
+            rows = [self._row_values(*entry[:5]) + (entry[5], int(entry[6])) for entry in entries]
+            self.connection.executemany(
+                "INSERT INTO entries (word, sort_key, word_type, definitions, examples, updated_at, "
+                "rendered, verbatim) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._count_entries(rows)
+            self._bump_content_version()
+        return len(entries)
+
+    def _count_entries(self, rows: Sequence[Tuple]):
+        # Must run inside the transaction that inserts the rows (as built by _row_values).
+        updates: Dict[Tuple[str, str], float] = {}
+        for row in rows:
+            for key in (("entries", ""), ("entries_by_type", row[2]),
+                        ("entries_by_month", time.strftime("%Y-%m", time.localtime(row[5])))):
+                updates[key] = updates.get(key, 0) + 1
+        self._add_stats([(name, bucket, amount) for (name, bucket), amount in updates.items()])
+
+    def _add_stats(self, updates: Sequence[Tuple[str, str, float]]):
+        self.connection.executemany(
+            "INSERT INTO stats (name, bucket, value) VALUES (?, ?, ?) "
+            "ON CONFLICT (name, bucket) DO UPDATE SET value = value + excluded.value",
+            updates,
+        )
+
+    def _rebuild_entry_stats(self):
+        """Recomputes the entry totals from the entries table (once per store, see STATS_VERSION)."""
+        with self.lock, self.connection:
+            self.connection.execute(
+                "DELETE FROM stats WHERE name IN ('entries', 'entries_by_type', 'entries_by_month')"
+            )
+            self.connection.execute(
+                "INSERT INTO stats (name, bucket, value) SELECT 'entries', '', COUNT(*) FROM entries"
+            )
+            self.connection.execute(
+                "INSERT INTO stats (name, bucket, value) "
+                "SELECT 'entries_by_type', word_type, COUNT(*) FROM entries GROUP BY word_type"
+            )
+            self.connection.execute(
+                "INSERT INTO stats (name, bucket, value) "
+                "SELECT 'entries_by_month', strftime('%Y-%m', updated_at, 'unixepoch', 'localtime'), COUNT(*) "
+                "FROM entries GROUP BY 1"
+            )
+            self.connection.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('stats_version', ?)", (STATS_VERSION,)
+            )
+
+    def add_stats(self, updates: Sequence[Tuple[str, str, float]]):
+        """Adds amounts to running totals, given as (name, bucket, amount) tuples."""
+        with self.lock, self.connection:
+            self._add_stats(updates)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Returns every running total as {name: {bucket: value}}."""
+        with self.lock:
+            rows = self.connection.execute("SELECT name, bucket, value FROM stats").fetchall()
+        totals: Dict[str, Dict[str, float]] = {}
+        for name, bucket, value in rows:
+            totals.setdefault(name, {})[bucket] = value
+        return totals
+
+    def stat(self, name: str, bucket: str = "") -> float:
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT value FROM stats WHERE name = ? AND bucket = ?", (name, bucket)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def _bump_content_version(self):
+        # Must run inside the transaction that makes the change.
+        self.connection.execute(
+            "INSERT INTO meta (key, value) VALUES ('content_version', '1') "
+            "ON CONFLICT (key) DO UPDATE SET value = CAST(value AS INTEGER) + 1"
+        )
+
+    def content_version(self) -> int:
+        return int(self.get_meta("content_version") or 0)
+
+    def max_id(self) -> int:
+        with self.lock:
+            return self.connection.execute("SELECT COALESCE(MAX(id), 0) FROM entries").fetchone()[0]
+
+    def count(self) -> int:
+        with self.lock:
+            return self.connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def entries(self) -> Iterator[Dict]:
+        """Yields all entries in alphabetical order."""
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT id, word, word_type, definitions, examples FROM entries ORDER BY sort_key, id"
+            ).fetchall()
+        for row in rows:
+            yield self._decode(row)
+
+    def iter_entries(self, after: Optional[Tuple[str, int]] = None, batch_size: int = 1000) -> Iterator[Dict]:
+        """Yields entries in alphabetical order, fetching batch_size rows at a time.
+
+        Unlike entries, only one batch is held in memory. Each entry also
+        carries its "position", a (sort_key, id) pair that can be passed back
+        as after to continue from the following entry.
+        """
+        last = tuple(after) if after else None
+        while True:
+            with self.lock:
+                if last is None:
+                    rows = self.connection.execute(
+                        "SELECT id, word, word_type, definitions, examples, sort_key FROM entries "
+                        "ORDER BY sort_key, id LIMIT ?",
+                        (batch_size,),
+                    ).fetchall()
+                else:
+                    rows = self.connection.execute(
+                        "SELECT id, word, word_type, definitions, examples, sort_key FROM entries "
+                        "WHERE (sort_key, id) > (?, ?) ORDER BY sort_key, id LIMIT ?",
+                        (*last, batch_size),
+                    ).fetchall()
+            for row in rows:
+                entry = self._decode(row)
+                entry["position"] = (row[5], row[0])
+                yield entry
+            if len(rows) < batch_size:
+                return
+            last = (rows[-1][5], rows[-1][0])
+
+    def entries_since(self, last_id: int) -> List[Dict]:
+        """Returns entries with an id above last_id, e.g. ones added by another process."""
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT id, word, word_type, definitions, examples FROM entries WHERE id > ? ORDER BY id",
+                (last_id,),
+            ).fetchall()
+        return [self._decode(row) for row in rows]
+
+    def unrendered(self) -> List[Tuple]:
+        """Returns (id, word, word_type, definitions, examples) for entries needing a render."""
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT id, word, word_type, definitions, examples FROM entries WHERE rendered IS NULL"
+            ).fetchall()
+        return [(row[0], row[1], row[2], json.loads(row[3]), json.loads(row[4])) for row in rows]
+
+    def count_unrendered(self) -> int:
+        with self.lock:
+            return self.connection.execute(
+                "SELECT COUNT(*) FROM entries WHERE rendered IS NULL"
+            ).fetchone()[0]
+
+    def set_rendered(self, rendered: Sequence[Tuple[int, str]]):
+        with self.lock, self.connection:
+            self.connection.executemany(
+                "UPDATE entries SET rendered = ? WHERE id = ?",
+                [(text, entry_id) for entry_id, text in rendered],
+            )
+
+    def update_rendered_entries(self, updates: Sequence[Tuple]) -> int:
+        """Replaces entries by their cached rendering, e.g. after vocab_lint fixed them.
+
+        Each update is (old_rendered, word, sort_key, word_type, definitions,
+        examples, new_rendered). Rows whose rendering is not old_rendered are
+        left alone. Returns the number of rows changed.
+        """
+        changed = 0
+        with self.lock, self.connection:
+            for old_rendered, word, sort_key, word_type, definitions, examples, rendered in updates:
+                old_types = [row[0] for row in self.connection.execute(
+                    "SELECT word_type FROM entries WHERE rendered = ?", (old_rendered,)
+                )]
+                self._add_stats([("entries_by_type", old_type, -1) for old_type in old_types]
+                                + [("entries_by_type", word_type, len(old_types))])
+                cursor = self.connection.execute(
+                    "UPDATE entries SET word = ?, sort_key = ?, word_type = ?, definitions = ?, examples = ?, "
+                    "updated_at = ?, rendered = ?, verbatim = 0 WHERE rendered = ?",
+                    self._row_values(word, sort_key, word_type, definitions, examples) + (rendered, old_rendered),
+                )
+                changed += cursor.rowcount
+            if changed:
+                self._bump_content_version()
+        return changed
+
+    def invalidate_rendered(self):
+        with self.lock, self.connection:
+            self.connection.execute("UPDATE entries SET rendered = NULL WHERE verbatim = 0")
+
+    def rendered_entries(self) -> List[str]:
+        """Returns the cached LaTeX of every rendered entry, in alphabetical order.
+
+        Entries committed by another process after the caller rendered are
+        skipped; their own build picks them up.
+        """
+        with self.lock:
+            return [row[0] for row in self.connection.execute(
+                "SELECT rendered FROM entries WHERE rendered IS NOT NULL ORDER BY sort_key, id"
+            )]
+
+    def get_meta(self, key: str) -> Optional[str]:
+        with self.lock:
+            row = self.connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str):
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value)
+            )